@@ -1,58 +1,419 @@
+from __future__ import annotations
 from argparse import ArgumentParser, ArgumentError
 from adventofcode.common import Solution
+from adventofcode.common.graph.search import SearchStats, add_search_listener, remove_search_listener
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
 from datetime import timedelta
+from math import ceil
+from statistics import median
 from time import perf_counter_ns
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import adventofcode
+import cProfile
+import csv
 import importlib
+import json
+import os
+import pkgutil
+import pstats
 import re
+import signal
+import sys
+import tracemalloc
+
+
+class SolutionTimeout(Exception):
+    pass
+
+
+PHASES = ('init', 'part_one', 'part_two')
+BASELINE_NOISE_FLOOR_NS = 1_000_000
+
+
+def percentile(samples: List[int], p: float) -> int:
+    # nearest-rank percentile
+    ordered = sorted(samples)
+    return ordered[max(0, ceil(p / 100 * len(ordered)) - 1)]
+
+
+class SolutionResult(object):
+    def __init__(self, year: str, day: str):
+        self._year = year
+        self._day = day
+        self._timings: Dict[str, List[int]] = {phase: [] for phase in PHASES}
+        self._part_one = None
+        self._part_two = None
+        self._error = None
+        self._searches: List[Dict] = []
+
+    @property
+    def year(self) -> str:
+        return self._year
+
+    @property
+    def day(self) -> str:
+        return self._day
+
+    @property
+    def key(self) -> str:
+        return f"{self._year}/{self._day}"
+
+    @property
+    def repeat(self) -> int:
+        return len(self._timings['part_two'])
+
+    @property
+    def init_time(self) -> Optional[int]:
+        return self.timing('init')
+
+    @property
+    def part_one_time(self) -> Optional[int]:
+        return self.timing('part_one')
+
+    @property
+    def part_two_time(self) -> Optional[int]:
+        return self.timing('part_two')
+
+    @property
+    def part_one(self) -> Optional[str]:
+        return self._part_one
+
+    @part_one.setter
+    def part_one(self, answer: str):
+        self._part_one = answer
+
+    @property
+    def part_two(self) -> Optional[str]:
+        return self._part_two
+
+    @part_two.setter
+    def part_two(self, answer: str):
+        self._part_two = answer
+
+    @property
+    def error(self) -> Optional[str]:
+        return self._error
+
+    @error.setter
+    def error(self, error: str):
+        self._error = error
+
+    @property
+    def searches(self) -> List[Dict]:
+        return self._searches
+
+    @property
+    def total_time(self) -> int:
+        return sum((t for t in (self.timing(phase) for phase in PHASES) if t is not None))
+
+    def add_timing(self, phase: str, time_ns: int) -> SolutionResult:
+        self._timings[phase].append(time_ns)
+        return self
+
+    def add_search(self, phase: str, stats: SearchStats) -> SolutionResult:
+        self._searches.append({'phase': phase, **stats.to_dict()})
+        return self
+
+    def samples(self, phase: str) -> List[int]:
+        return self._timings[phase]
+
+    def timing(self, phase: str) -> Optional[int]:
+        # median across all runs
+        return int(median(self._timings[phase])) if len(self._timings[phase]) > 0 else None
+
+    def stats(self, phase: str) -> Dict[str, Optional[int]]:
+        samples = self._timings[phase]
+        if len(samples) == 0:
+            return {'min': None, 'median': None, 'p95': None}
+        return {'min': min(samples), 'median': int(median(samples)), 'p95': percentile(samples, 95)}
+
+    def to_dict(self) -> Dict:
+        return {
+            'year': self._year,
+            'day': self._day,
+            'part_one': self._part_one,
+            'part_two': self._part_two,
+            'error': self._error,
+            'repeat': self.repeat,
+            'timings_ns': {phase: self.stats(phase) for phase in PHASES},
+            'searches': self._searches
+        }
+
+
+def _load_solution_class(year: str, day: str):
+    solution_name = f"Day{day}"
+    module = importlib.import_module(f"adventofcode.year{year}.{solution_name.lower()}")
+    return getattr(module, solution_name)
+
+
+def _raise_timeout(signum, frame):
+    raise SolutionTimeout()
+
+
+def run_solution(year: str, day: str, timeout: Optional[float] = None, repeat: int = 1) -> SolutionResult:
+    # runs a single solution quietly (solutions print grids and progress freely) and collects its timings and answers.
+    # each repeat builds a fresh solution instance so init is measured too. timeout covers all repeats.
+    # stats of every AStar/BFS/DFS search are recorded for the first run
+    result = SolutionResult(year, day)
+    phase = None
+    record_searches = True
+
+    def search_listener(stats: SearchStats) -> None:
+        if record_searches:
+            result.add_search(phase, stats)
+
+    add_search_listener(search_listener)
+    use_alarm = timeout is not None and hasattr(signal, 'SIGALRM')
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            clss = _load_solution_class(year, day)
+            for run in range(repeat):
+                record_searches = run == 0
+                phase = 'init'
+                s = perf_counter_ns()
+                solution: Solution = clss(year, day)
+                result.add_timing('init', perf_counter_ns() - s)
+                phase = 'part_one'
+                s = perf_counter_ns()
+                result.part_one = str(solution.part_one())
+                result.add_timing('part_one', perf_counter_ns() - s)
+                phase = 'part_two'
+                s = perf_counter_ns()
+                result.part_two = str(solution.part_two())
+                result.add_timing('part_two', perf_counter_ns() - s)
+    except SolutionTimeout:
+        result.error = f"timed out after {timeout}s"
+    except Exception as e:
+        result.error = f"{type(e).__name__} : {e}"
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        remove_search_listener(search_listener)
+    return result
+
+
+def discover_solutions(year: str, days: Optional[Tuple[int, int]] = None) -> List[Tuple[str, str]]:
+    # finds every adventofcode.yearYYYY.dayDD module, optionally limited to one year and a range of days
+    if year == 'all':
+        years = sorted((m.name[4:] for m in pkgutil.iter_modules(adventofcode.__path__) if re.fullmatch(r"year\d\d\d\d", m.name)))
+    else:
+        years = [year]
+
+    solutions = []
+    for y in years:
+        package = importlib.import_module(f"adventofcode.year{y}")
+        for m in sorted(pkgutil.iter_modules(package.__path__), key=lambda m: m.name):
+            if not re.fullmatch(r"day\d\d", m.name):
+                continue
+            if days is not None and not (days[0] <= int(m.name[3:]) <= days[1]):
+                continue
+            solutions.append((y, m.name[3:]))
+    return solutions
 
 
 class App(object):
     def __init__(self):
         self._solution = None
+        self._profiler = None
+        self._profile_top = 20
+        self._profile_dir = '.'
+        self._profile_name = None
 
     def _lapsed_time(self, time_ns: int) -> str:
         delta = timedelta(microseconds=(time_ns // 1000))
         return "Elapsed : {h:02d}:{m:02d}:{s:02d}.{ms:03d}".format(h=delta.days*24, m=delta.seconds//60, s=delta.seconds%60, ms=delta.microseconds//1000)
 
+    def _result_line(self, result: SolutionResult) -> str:
+        if result.error is not None:
+            return f"{result.year} day{result.day} : FAILED : {result.error}"
+        return f"{result.year} day{result.day} : {result.part_one} : {result.part_two} : {self._lapsed_time(result.total_time)}"
+
+    def _run_phase(self, phase: str, fn: Callable[[], Any]) -> Any:
+        if self._profiler is None:
+            return fn()
+        return getattr(self, f"_run_phase_{self._profiler}")(phase, fn)
+
+    def _run_phase_cprofile(self, phase: str, fn: Callable[[], Any]) -> Any:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return fn()
+        finally:
+            profiler.disable()
+            path = os.path.join(self._profile_dir, f"{self._profile_name}-{phase}.pstats")
+            profiler.dump_stats(path)
+            print(f"-----{phase} profile ({path})-----")
+            pstats.Stats(profiler, stream=sys.stdout).sort_stats(pstats.SortKey.TIME).print_stats(self._profile_top)
+
+    def _run_phase_tracemalloc(self, phase: str, fn: Callable[[], Any]) -> Any:
+        tracemalloc.start()
+        try:
+            return fn()
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"-----{phase} memory-----")
+            print(f"peak : {peak / 1024 / 1024:.3f}MiB : retained : {current / 1024 / 1024:.3f}MiB")
+            for stat in snapshot.statistics('lineno')[:self._profile_top]:
+                print(stat)
+
+    def profile(self, profiler: str, top: int = 20, profile_dir: str = '.') -> App:
+        # wraps each phase of the next run with cprofile (pstats file + hot function table) or tracemalloc (peak memory)
+        if profiler not in ('cprofile', 'tracemalloc'):
+            raise ArgumentError(None, f"unsupported profiler : {profiler}")
+        self._profiler = profiler
+        self._profile_top = top
+        self._profile_dir = profile_dir
+        return self
+
     def run(self, year: str, day: str) -> None:
         if not re.match(r"\d\d\d\d", year):
-            raise ArgumentError("year must be YYYY format")
+            raise ArgumentError(None, "year must be YYYY format")
         if not re.match(r"\d\d", day):
-            raise ArgumentError("day must be DD format")
+            raise ArgumentError(None, "day must be DD format")
 
-        solution_name = f"Day{day}"
-        solution_path = f"adventofcode.year{year}.{solution_name.lower()}"
-        module = importlib.import_module(solution_path)
-        clss = getattr(module, solution_name)
+        clss = _load_solution_class(year, day)
+        self._profile_name = f"{year}-day{day}"
 
         print('-----init-----')
         s = perf_counter_ns()
-        self._solution: Solution = clss(year, day)
+        self._solution: Solution = self._run_phase('init', lambda: clss(year, day))
         print(self._lapsed_time(perf_counter_ns() - s))
         print(' ')
         print('-----part one-----')
         s = perf_counter_ns()
-        print(str(self._solution.part_one()))
+        print(str(self._run_phase('part_one', self._solution.part_one)))
         print(self._lapsed_time(perf_counter_ns() - s))
         print(' ')
         print('-----part two-----')
         s = perf_counter_ns()
-        print(str(self._solution.part_two()))
+        print(str(self._run_phase('part_two', self._solution.part_two)))
         print(self._lapsed_time(perf_counter_ns() - s))
 
+    def run_batch(self, solutions: List[Tuple[str, str]], workers: Optional[int] = None, timeout: Optional[float] = None, repeat: int = 1, output_format: str = 'text') -> List[SolutionResult]:
+        # progress lines go to stderr for machine readable formats so stdout stays parseable
+        progress = sys.stdout if output_format == 'text' else sys.stderr
+        results = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_solution, year, day, timeout, repeat) for year, day in solutions]
+            # stream results back as each solution finishes
+            for future in as_completed(futures):
+                result = future.result()
+                print(self._result_line(result), file=progress, flush=True)
+                results.append(result)
+
+        results.sort(key=lambda r: (r.year, r.day))
+        getattr(self, f"_report_{output_format}")(results)
+        return results
+
+    def _report_text(self, results: List[SolutionResult]) -> None:
+        print(' ')
+        print('-----report-----')
+        print(f"{'year':<6}{'day':<5}{'init':>14}{'part one':>14}{'part two':>14}{'total':>14}")
+        for r in results:
+            if r.error is not None:
+                print(f"{r.year:<6}{r.day:<5}  FAILED : {r.error}")
+                continue
+            print(f"{r.year:<6}{r.day:<5}{r.init_time / 1e6:>12.3f}ms{r.part_one_time / 1e6:>12.3f}ms{r.part_two_time / 1e6:>12.3f}ms{r.total_time / 1e6:>12.3f}ms")
+            for search in r.searches:
+                print(f"{'':<11}{search['phase']:<10} {search['engine']} : expanded {search['expanded']} : generated {search['generated']} : max frontier {search['max_frontier']} : {search['wall_time_ns'] / 1e6:.3f}ms")
+            if r.repeat > 1:
+                for phase in PHASES:
+                    stats = r.stats(phase)
+                    print(f"{'':<11}{phase:<10} min {stats['min'] / 1e6:.3f}ms : median {stats['median'] / 1e6:.3f}ms : p95 {stats['p95'] / 1e6:.3f}ms")
+        failed = sum((1 for r in results if r.error is not None))
+        print(f"{len(results)} solutions, {failed} failed, {self._lapsed_time(sum((r.total_time for r in results)))}")
+
+    def _report_json(self, results: List[SolutionResult]) -> None:
+        print(json.dumps({'solutions': [r.to_dict() for r in results]}, indent=2))
+
+    def _report_csv(self, results: List[SolutionResult]) -> None:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(['year', 'day', 'part_one', 'part_two', 'error', 'repeat'] + [f"{phase}_{stat}_ns" for phase in PHASES for stat in ('min', 'median', 'p95')])
+        for r in results:
+            writer.writerow([r.year, r.day, r.part_one, r.part_two, r.error, r.repeat] + [r.stats(phase)[stat] for phase in PHASES for stat in ('min', 'median', 'p95')])
+
+    def compare_to_baseline(self, results: List[SolutionResult], baseline_path: str, threshold: float) -> List[str]:
+        # baseline file is the --format json output of a previous run. a solution regresses when its answers change,
+        # it starts failing, or its median total time grows by more than threshold (ignoring sub-millisecond jitter)
+        with open(baseline_path) as f:
+            baseline = {f"{s['year']}/{s['day']}": s for s in json.load(f)['solutions']}
+
+        regressions = []
+        for r in results:
+            if r.key not in baseline:
+                continue
+            b = baseline[r.key]
+            if r.error is not None:
+                if b['error'] is None:
+                    regressions.append(f"{r.key} : now failing : {r.error}")
+                continue
+            if b['error'] is not None:
+                continue
+            if (r.part_one, r.part_two) != (b['part_one'], b['part_two']):
+                regressions.append(f"{r.key} : answers changed : {b['part_one']}, {b['part_two']} -> {r.part_one}, {r.part_two}")
+            baseline_total = sum((b['timings_ns'][phase]['median'] for phase in PHASES))
+            if r.total_time > baseline_total * (1 + threshold) and r.total_time - baseline_total > BASELINE_NOISE_FLOOR_NS:
+                regressions.append(f"{r.key} : slowed down : {baseline_total / 1e6:.3f}ms -> {r.total_time / 1e6:.3f}ms ({r.total_time / baseline_total - 1:+.1%})")
+        return regressions
+
+
+def _parse_days(day: str) -> Optional[Tuple[int, int]]:
+    if day is None:
+        return None
+    r = re.fullmatch(r"(\d\d)(?:-(\d\d))?", day)
+    if r is None:
+        raise ArgumentError(None, "day must be DD or DD-DD format")
+    return int(r.group(1)), int(r.group(2) or r.group(1))
+
 
 def main():
     parser = ArgumentParser()
-    parser.add_argument('year', type=str, help='year (YYYY)')
-    parser.add_argument('day', type=str, help='day (DD)')
+    parser.add_argument('year', type=str, help='year (YYYY) or "all"')
+    parser.add_argument('day', type=str, nargs='?', default=None, help='day (DD) or day range (DD-DD). omit to run every day of the year')
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes for batch runs (defaults to cpu count)')
+    parser.add_argument('--timeout', type=float, default=None, help='per-solution timeout in seconds for batch runs, covering all repeats')
+    parser.add_argument('--format', type=str, default='text', choices=['text', 'json', 'csv'], help='report format. json and csv report timings in nanoseconds')
+    parser.add_argument('--repeat', type=int, default=1, help='run each solution N times and report min/median/p95 timings')
+    parser.add_argument('--baseline', type=str, default=None, help='json report from a previous run to check for regressions against')
+    parser.add_argument('--threshold', type=float, default=0.10, help='allowed slowdown ratio against the baseline (default 0.10)')
+    parser.add_argument('--profile', type=str, default=None, choices=['cprofile', 'tracemalloc'], help='profile each phase of a single day')
+    parser.add_argument('--profile-top', type=int, default=20, help='number of hot functions or allocation sites to show per phase')
+    parser.add_argument('--profile-dir', type=str, default='.', help='directory to write pstats files to')
     args = parser.parse_args()
 
     year = args.year
     day = args.day
 
     app = App()
-    app.run(year, day)
+    single_day = year != 'all' and day is not None and re.fullmatch(r"\d\d", day)
+    if single_day and args.profile is not None:
+        app.profile(args.profile, args.profile_top, args.profile_dir).run(year, day)
+        return
+    if args.profile is not None:
+        raise ArgumentError(None, "--profile requires a single YYYY DD solution")
+    if single_day and args.format == 'text' and args.repeat == 1 and args.baseline is None:
+        app.run(year, day)
+        return
+
+    if year != 'all' and not re.fullmatch(r"\d\d\d\d", year):
+        raise ArgumentError(None, "year must be YYYY format or all")
+    results = app.run_batch(discover_solutions(year, _parse_days(day)), args.workers, args.timeout, args.repeat, args.format)
+
+    failed = any((r.error is not None for r in results))
+    if args.baseline is not None:
+        regressions = app.compare_to_baseline(results, args.baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        failed = failed or len(regressions) > 0
+    if failed:
+        sys.exit(1)
 
 
 if __name__ == '__main__':
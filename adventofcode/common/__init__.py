@@ -1,6 +1,75 @@
-from typing import List
+from array import array
+from typing import Iterator, List, Optional
 
+import io
+import mmap
 import os
+import re
+
+
+class InputFile(object):
+    def __init__(self, file_path: str):
+        stat = os.stat(file_path)
+        self._file_path = file_path
+        self._version = (stat.st_mtime_ns, stat.st_size)
+        self._text = None
+        with open(file_path, 'rb') as f:
+            # empty files cannot be memory-mapped
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size > 0 else b''
+
+    @property
+    def file_path(self) -> str:
+        return self._file_path
+
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def data(self) -> memoryview:
+        return memoryview(self._data)
+
+    @property
+    def text(self) -> str:
+        # decoded the same way open() would, including universal newlines, and only once per file version
+        if self._text is None:
+            self._text = io.TextIOWrapper(io.BytesIO(self._data)).read()
+        return self._text
+
+    def close(self) -> None:
+        # unmaps the file. a view handed out by data keeps the map alive until that view is released, so the map is then
+        # left for it to clean up
+        if isinstance(self._data, mmap.mmap):
+            try:
+                self._data.close()
+            except BufferError:
+                pass
+        self._data = b''
+
+    def iter_lines(self) -> Iterator[bytes]:
+        start = 0
+        size = len(self._data)
+        while start < size:
+            end = self._data.find(b'\n', start)
+            end = size if end == -1 else end + 1
+            yield self._data[start:end]
+            start = end
+
+
+# the current input file, revalidated against mtime/size so repeated loads and runs of the same day skip disk reads.
+# only one is kept, so a batch run over many days holds a single open map at a time
+_input_file: Optional[InputFile] = None
+
+
+def load_input_file(file_path: str) -> InputFile:
+    global _input_file
+    stat = os.stat(file_path)
+    cached = _input_file
+    if cached is None or cached.file_path != file_path or cached.version != (stat.st_mtime_ns, stat.st_size):
+        if cached is not None:
+            cached.close()
+        cached = _input_file = InputFile(file_path)
+    return cached
 
 
 class Solution(object):
@@ -8,21 +77,42 @@ class Solution(object):
         self._year = year
         self._day = day
 
+    @property
+    def _input_path(self) -> str:
+        return f"{os.environ['ADVENT_OF_CODE_INPUT']}/{self._year}/day{self._day}.txt"
+
     def _load_input_as_string(self, strip: bool = True) -> str:
-        file_path = f"{os.environ['ADVENT_OF_CODE_INPUT']}/{self._year}/day{self._day}.txt"
-        with open(file_path) as f:
-            if strip:
-                return f.read().replace('\n', '').strip()
-            else:
-                return f.read().replace('\n', '')
+        if strip:
+            return load_input_file(self._input_path).text.replace('\n', '').strip()
+        else:
+            return load_input_file(self._input_path).text.replace('\n', '')
 
     def _load_input_as_lines(self, strip: bool = True) -> List[str]:
-        file_path = f"{os.environ['ADVENT_OF_CODE_INPUT']}/{self._year}/day{self._day}.txt"
-        with open(file_path) as f:
-            if strip:
-                return [line.strip() for line in f.readlines()]
-            else:
-                return [line for line in f.readlines()]
+        lines = io.StringIO(load_input_file(self._input_path).text).readlines()
+        if strip:
+            return [line.strip() for line in lines]
+        else:
+            return lines
+
+    def _load_input_as_bytes(self) -> memoryview:
+        # zero-copy read-only view over the memory-mapped input
+        return load_input_file(self._input_path).data
+
+    def _iter_input_lines(self, strip: bool = True) -> Iterator[str]:
+        # streams lines without decoding the whole input up front
+        for line in load_input_file(self._input_path).iter_lines():
+            yield line.decode().strip() if strip else line.decode().replace('\r\n', '\n')
+
+    def _load_input_as_ints(self, separator: Optional[bytes] = None) -> array:
+        # every (optionally negative) integer in the input, e.g. comma separated programs. separator restricts splitting to that delimiter
+        data = load_input_file(self._input_path).data
+        if separator is None:
+            return array('q', (int(m.group()) for m in re.finditer(rb"-?\d+", data)))
+        return array('q', (int(v) for v in bytes(data).split(separator) if v.strip()))
+
+    def _load_input_as_grid(self) -> List[bytearray]:
+        # character grid as mutable byte rows with line endings removed
+        return [bytearray(line.rstrip(b'\r\n')) for line in load_input_file(self._input_path).iter_lines()]
 
     def _init(self):
         raise Exception("_init not implemented!")
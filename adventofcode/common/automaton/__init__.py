@@ -0,0 +1,307 @@
+from __future__ import annotations
+from math import prod
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import re
+
+
+class Rule(object):
+    def __init__(self, birth: Iterable[int], survive: Iterable[int]):
+        # neighbor counts at which a dead cell comes alive and a live cell stays alive
+        self._birth = frozenset(birth)
+        self._survive = frozenset(survive)
+
+    @classmethod
+    def parse(cls, rule: str) -> Rule:
+        # life-like notation, e.g. B3/S23
+        r = re.fullmatch(r"B(\d*)/S(\d*)", rule)
+        if r is None:
+            raise Exception(f"Invalid rule : {rule}")
+        return cls((int(c) for c in r.group(1)), (int(c) for c in r.group(2)))
+
+    def __str__(self):
+        return f"B{''.join(map(str, sorted(self._birth)))}/S{''.join(map(str, sorted(self._survive)))}"
+
+    @property
+    def birth(self) -> frozenset:
+        return self._birth
+
+    @property
+    def survive(self) -> frozenset:
+        return self._survive
+
+
+conway = Rule.parse('B3/S23')
+
+
+def add_planes(a: List[int], b: List[int]) -> List[int]:
+    # ripple carry addition of two bit-sliced numbers, plane i holding bit i of the count of every cell at once
+    planes = []
+    carry = 0
+    for i in range(max(len(a), len(b))):
+        x = a[i] if i < len(a) else 0
+        y = b[i] if i < len(b) else 0
+        planes.append(x ^ y ^ carry)
+        carry = (x & y) | (carry & (x ^ y))
+    if carry:
+        planes.append(carry)
+    return planes
+
+
+def select_planes(planes: List[int], values: Iterable[int], mask: int) -> int:
+    # bitset of the cells within mask whose bit-sliced count is one of values
+    selected = 0
+    for value in values:
+        if value >> len(planes):
+            continue
+        matching = mask
+        for i, plane in enumerate(planes):
+            matching &= plane if value >> i & 1 else ~plane
+        selected |= matching
+    return selected
+
+
+def set_bits(indexes: Iterable[int], size: int) -> int:
+    # builds a bitset through a byte buffer, which is linear in size rather than in size times the number of bits
+    buffer = bytearray((size + 7) // 8)
+    for i in indexes:
+        buffer[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+def repeat_bits(pattern: int, period: int, count: int) -> int:
+    # pattern repeated count times, period bits apart, by doubling. dividing all ones by a period mask would do the same
+    # but big int division is quadratic
+    repeated = 0
+    block, blocks, shift = pattern, 1, 0
+    while count:
+        if count & 1:
+            repeated |= block << shift
+            shift += blocks * period
+        block |= block << (blocks * period)
+        blocks *= 2
+        count >>= 1
+    return repeated
+
+
+def bit_indexes(bits: int) -> Iterator[int]:
+    digits = bin(bits)[:1:-1]
+    i = digits.find('1')
+    while i >= 0:
+        yield i
+        i = digits.find('1', i + 1)
+
+
+class LifeGrid(object):
+    def __init__(self, shape: Sequence[int], rule: Rule, live: Iterable[Sequence[int]] = (), neighborhood: str = 'moore',
+                 bounded: bool = True, habitat: Optional[Iterable[Sequence[int]]] = None):
+        # an n-dimensional box of cells held as a single int, one bit per cell with dimension 0 running fastest. every
+        # dimension is padded by a dead cell on both sides so that shifting by a stride moves cells to their neighbor
+        # without wrapping into the next row. neighbor counts are then bit-sliced sums of shifted copies, covering every
+        # cell in a handful of big int operations. an unbounded grid grows its box whenever live cells reach the edge
+        if neighborhood not in ('moore', 'von_neumann'):
+            raise Exception(f"Unsupported neighborhood : {neighborhood}")
+        if not bounded and 0 in rule.birth:
+            raise Exception(f"Rule {rule} would bring infinitely many cells alive in an unbounded grid")
+        self._rule = rule
+        self._neighborhood = neighborhood
+        self._bounded = bounded
+        self._origin = tuple(0 for _ in shape)
+        self._layout(tuple(shape))
+        self._cells = self._bitset(live)
+        self._habitat = self._bitset(habitat) if habitat is not None else None
+        self._stuck = 0
+        self._generation = 0
+
+    def _layout(self, shape: Tuple[int, ...]) -> None:
+        self._shape = shape
+        self._padded = tuple(size + 2 for size in shape)
+        self._strides = tuple(prod(self._padded[:d]) for d in range(len(shape)))
+        self._size = prod(self._padded)
+        # interior cells, built up a dimension at a time by repeating the previous dimension's block
+        interior = ((1 << shape[0]) - 1) << 1
+        for d in range(1, len(shape)):
+            stride = self._strides[d]
+            interior = repeat_bits(interior, stride, shape[d]) << stride
+        self._interior = interior
+        # first and last interior layer along every dimension, which live cells must stay clear of in an unbounded grid
+        self._edges = tuple((self._layer(d, 1), self._layer(d, shape[d])) for d in range(len(shape)))
+
+    def _layer(self, dimension: int, index: int) -> int:
+        # interior cells whose coordinate along dimension sits at the given padded index
+        stride = self._strides[dimension]
+        period = stride * self._padded[dimension]
+        slab = ((1 << stride) - 1) << (index * stride)
+        return self._interior & repeat_bits(slab, period, self._size // period)
+
+    def _inside(self, coordinate: Sequence[int]) -> bool:
+        return all(0 <= c + origin < size for c, origin, size in zip(coordinate, self._origin, self._shape))
+
+    def _index(self, coordinate: Sequence[int]) -> int:
+        if not self._inside(coordinate):
+            raise Exception(f"Coordinate {tuple(coordinate)} is outside of the grid")
+        return sum((c + origin + 1) * stride for c, origin, stride in zip(coordinate, self._origin, self._strides))
+
+    def _coordinate(self, index: int) -> Tuple[int, ...]:
+        coordinate = []
+        for padded, origin in zip(self._padded, self._origin):
+            index, c = divmod(index, padded)
+            coordinate.append(c - 1 - origin)
+        return tuple(coordinate)
+
+    def _bitset(self, coordinates: Iterable[Sequence[int]]) -> int:
+        return set_bits((self._index(c) for c in coordinates), self._size)
+
+    def _grow(self, margins: Sequence[Tuple[int, int]]) -> None:
+        # re-lays the box with the given number of extra cells before and after every dimension
+        live = list(self.live())
+        stuck = [self._coordinate(i) for i in bit_indexes(self._stuck)]
+        habitat = [self._coordinate(i) for i in bit_indexes(self._habitat)] if self._habitat is not None else None
+        self._origin = tuple(origin + low for origin, (low, _) in zip(self._origin, margins))
+        self._layout(tuple(size + low + high for size, (low, high) in zip(self._shape, margins)))
+        self._cells = self._bitset(live)
+        self._stuck = self._bitset(stuck)
+        if habitat is not None:
+            self._habitat = self._bitset(habitat)
+
+    def _expand(self) -> None:
+        # only the sides live cells have reached grow, by half again the size so that growth is amortised
+        margins = [
+            (max(2, size // 2) if self._cells & low else 0, max(2, size // 2) if self._cells & high else 0)
+            for size, (low, high) in zip(self._shape, self._edges)
+        ]
+        if any(low or high for low, high in margins):
+            self._grow(margins)
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @property
+    def population(self) -> int:
+        return self._cells.bit_count()
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self._shape
+
+    @property
+    def origin(self) -> Tuple[int, ...]:
+        # how far coordinate 0 sits from the first cell of the box along every dimension
+        return self._origin
+
+    def alive(self, coordinate: Sequence[int]) -> bool:
+        return self._inside(coordinate) and self._cells >> self._index(coordinate) & 1 == 1
+
+    def live(self) -> Iterator[Tuple[int, ...]]:
+        for index in bit_indexes(self._cells):
+            yield self._coordinate(index)
+
+    def pin(self, coordinates: Iterable[Sequence[int]]) -> None:
+        # cells that are alive now and after every step
+        self._stuck |= self._bitset(coordinates)
+        self._cells |= self._stuck
+
+    def step(self) -> None:
+        if not self._bounded:
+            self._expand()
+
+        cells = self._cells
+        if self._neighborhood == 'moore':
+            # box sums of the 3^n block around every cell, one dimension at a time, so the cell itself is included
+            planes = [cells]
+            for stride in self._strides:
+                planes = add_planes(add_planes(planes, [p << stride for p in planes]), [p >> stride for p in planes])
+            survive = (v + 1 for v in self._rule.survive)
+        else:
+            planes = []
+            for stride in self._strides:
+                planes = add_planes(add_planes(planes, [cells << stride]), [cells >> stride])
+            survive = self._rule.survive
+
+        mask = self._interior if self._habitat is None else self._habitat
+        self._cells = (
+            select_planes(planes, survive, cells & mask) |
+            select_planes(planes, self._rule.birth, ~cells & mask) |
+            self._stuck
+        )
+        self._generation += 1
+
+    def run(self, steps: int) -> None:
+        # cells spread at most one cell a step, so an unbounded grid can make room for every step up front
+        if not self._bounded:
+            self._grow([(steps + 1, steps + 1)] * len(self._shape))
+        for _ in range(steps):
+            self.step()
+
+    def settle(self) -> None:
+        # steps until a generation is the same as the one before
+        previous = None
+        while previous != self._cells:
+            previous = self._cells
+            self.step()
+
+
+class LevelAutomaton(object):
+    def __init__(self, adjacency: Sequence[Sequence[Tuple[int, int]]], rule: Rule, live: Iterable[Tuple[int, int]] = ()):
+        # cells are (tile, level) pairs on an unbounded stack of levels. adjacency lists (tile, level delta) neighbors for
+        # every tile, which is the same on every level, so each tile keeps one int with a bit per level and a neighbor on
+        # another level is just a shift
+        if 0 in rule.birth:
+            raise Exception(f"Rule {rule} would bring infinitely many levels alive")
+        self._adjacency = adjacency
+        self._rule = rule
+        live = list(live)
+        self._tiles = [0] * len(adjacency)
+        # level 0 is at bit offset, which leaves bit 0 clear below the lowest live level
+        self._offset = 1 - min(0, min((level for _, level in live), default=0))
+        for tile, level in live:
+            self._tiles[tile] |= 1 << (level + self._offset)
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @property
+    def population(self) -> int:
+        return sum(bits.bit_count() for bits in self._tiles)
+
+    @property
+    def levels(self) -> range:
+        # levels holding at least one live cell
+        occupied = 0
+        for bits in self._tiles:
+            occupied |= bits
+        if occupied == 0:
+            return range(0)
+        return range((occupied & -occupied).bit_length() - 1 - self._offset, occupied.bit_length() - self._offset)
+
+    def alive(self, tile: int, level: int) -> bool:
+        return level + self._offset >= 0 and self._tiles[tile] >> (level + self._offset) & 1 == 1
+
+    def step(self) -> None:
+        # keeps bit 0 clear so there is room for the level below the lowest live one
+        if any(bits & 1 for bits in self._tiles):
+            self._tiles = [bits << 1 for bits in self._tiles]
+            self._offset += 1
+
+        tiles = self._tiles
+        mask = (1 << (max(bits.bit_length() for bits in tiles) + 1)) - 1
+        next_tiles = []
+        for tile, neighbors in enumerate(self._adjacency):
+            planes = []
+            for neighbor, delta in neighbors:
+                bits = tiles[neighbor]
+                planes = add_planes(planes, [bits >> delta if delta >= 0 else bits << -delta])
+            cells = tiles[tile]
+            next_tiles.append(
+                select_planes(planes, self._rule.survive, cells & mask) |
+                select_planes(planes, self._rule.birth, ~cells & mask)
+            )
+        self._tiles = next_tiles
+        self._generation += 1
+
+    def run(self, steps: int) -> None:
+        for _ in range(steps):
+            self.step()
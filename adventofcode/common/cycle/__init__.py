@@ -0,0 +1,93 @@
+from __future__ import annotations
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+
+S = TypeVar('S')
+
+
+class Cycle(object):
+    def __init__(self, prefix: int, period: int):
+        # states from step prefix onwards repeat every period steps
+        self._prefix = prefix
+        self._period = period
+
+    def __str__(self):
+        return f"prefix {self._prefix}, period {self._period}"
+
+    @property
+    def prefix(self) -> int:
+        return self._prefix
+
+    @property
+    def period(self) -> int:
+        return self._period
+
+    def index(self, target: int) -> int:
+        # earliest step whose state is the same as the one at target
+        if target < self._prefix:
+            return target
+        return self._prefix + (target - self._prefix) % self._period
+
+
+class CycleDetector(Generic[S]):
+    def __init__(self, step: Callable[[S], S], key: Optional[Callable[[S], Hashable]] = None):
+        # step must be a pure function of the state. states are compared through key, which has to be exact (two states
+        # with equal keys are the same state) but should be compact, e.g. packed bytes or a bitmask
+        self._step = step
+        self._key = key if key is not None else (lambda state: state)
+
+    def find(self, start: S, limit: Optional[int] = None) -> Cycle:
+        # Brent's algorithm, only ever holding two states. limit bounds the number of steps taken looking for a repeat
+        step, key = self._step, self._key
+
+        # find the period by moving the hare until it meets a tortoise that is teleported ahead at every power of two
+        power = period = 1
+        tortoise = key(start)
+        hare = step(start)
+        taken = 1
+        while tortoise != key(hare):
+            if power == period:
+                tortoise = key(hare)
+                power *= 2
+                period = 0
+            hare = step(hare)
+            period += 1
+            taken += 1
+            if limit is not None and taken > limit:
+                raise Exception(f"No cycle found within {limit} steps")
+
+        # walk two states period apart from the start until they coincide, which is where the cycle begins
+        tortoise = hare = start
+        for _ in range(period):
+            hare = step(hare)
+        prefix = 0
+        while key(tortoise) != key(hare):
+            tortoise = step(tortoise)
+            hare = step(hare)
+            prefix += 1
+        return Cycle(prefix, period)
+
+    def period(self, start: S, limit: Optional[int] = None) -> int:
+        # steps until the start comes around again. only valid for reversible steps, where every state is on its cycle
+        step, key = self._step, self._key
+        origin = key(start)
+        state = step(start)
+        period = 1
+        while key(state) != origin:
+            state = step(state)
+            period += 1
+            if limit is not None and period > limit:
+                raise Exception(f"Start did not come around again within {limit} steps")
+        return period
+
+    def advance(self, start: S, steps: int) -> S:
+        state = start
+        for _ in range(steps):
+            state = self._step(state)
+        return state
+
+    def state_at(self, start: S, target: int, cycle: Optional[Cycle] = None) -> S:
+        # state after target steps, fast-forwarded through the cycle
+        if cycle is None:
+            cycle = self.find(start)
+        return self.advance(start, cycle.index(target))
@@ -1,14 +1,37 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from collections import deque
+from collections import OrderedDict, deque
 from copy import copy
 from functools import reduce, total_ordering
-from queue import PriorityQueue
-from typing import Dict, List, Tuple, TypeVar
+from heapq import heapify, heappop, heappush
+from itertools import count
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union
+
+
+# identifies a search state in visited/score tables. ints (see pack_fingerprint) and tuples hash and compare far cheaper than formatted strings
+Fingerprint = Union[str, int, Tuple]
+
+
+def pack_fingerprint(values: Iterable[int], bits: int) -> int:
+    # packs non-negative values into consecutive fixed width fields of a single int
+    limit = 1 << bits
+    fingerprint = 0
+    for value in values:
+        if not 0 <= value < limit:
+            raise Exception(f"fingerprint value {value} does not fit in {bits} bits")
+        fingerprint = (fingerprint << bits) | value
+    return fingerprint
+
+
+def pack_coordinates(coordinates: Iterable[int], bits: int = 16) -> int:
+    # packs (possibly negative) coordinates by offsetting each into the middle of its field
+    offset = 1 << (bits - 1)
+    return pack_fingerprint((c + offset for c in coordinates), bits)
 
 
 class SearchState(ABC):
-    def __init__(self, fingerprint: str, gain: int, cost: int):
+    def __init__(self, fingerprint: Fingerprint, gain: int, cost: int):
         self._fingerprint = fingerprint
         self._gain = gain
         self._cost = cost
@@ -21,29 +44,29 @@ class SearchState(ABC):
         return self.fingerprint != other.fingerprint if issubclass(type(other), SearchState) else True
 
     def __lt__(self, other):
-        return (self.cost + self.potential_gain) < (other.cost + other.potential_gain)
+        return self.priority < other.priority
 
     def __le__(self, other):
-        return (self.cost + self.potential_gain) <= (other.cost + other.potential_gain)
+        return self.priority <= other.priority
 
     def __gt__(self, other):
-        return (self.cost + self.potential_gain) > (other.cost + other.potential_gain)
+        return self.priority > other.priority
 
     def __ge__(self, other):
-        return (self.cost + self.potential_gain) >= (other.cost + other.potential_gain)
+        return self.priority >= other.priority
 
     def __hash__(self):
         return hash(self.fingerprint)
 
     def __str__(self):
-        return self.fingerprint
+        return str(self.fingerprint)
 
     @property
-    def fingerprint(self) -> str:
+    def fingerprint(self) -> Fingerprint:
         return self._fingerprint
 
     @fingerprint.setter
-    def fingerprint(self, fingerprint: str):
+    def fingerprint(self, fingerprint: Fingerprint):
         self._fingerprint = fingerprint
 
     @property
@@ -58,6 +81,11 @@ class SearchState(ABC):
     def potential_gain(self) -> int:
         return 0
 
+    @property
+    def priority(self) -> int:
+        # search order for AStar...lowest first
+        return self._cost + self.potential_gain
+
     @property
     def completed(self) -> bool:
         return self._completed
@@ -86,16 +114,16 @@ class SearchPath(object):
         return self.gain != other.gain if issubclass(type(other), SearchPath) else False
 
     def __lt__(self, other):
-        return (self.cost + self.depth - (self.gain + self.potential_gain)) < (other.cost + other.depth - (other.gain + other.potential_gain))
+        return self.priority < other.priority
 
     def __le__(self, other):
-        return (self.cost + self.depth - (self.gain + self.potential_gain)) <= (other.cost + other.depth - (other.gain + other.potential_gain))
+        return self.priority <= other.priority
 
     def __gt__(self, other):
-        return (self.cost + self.depth - (self.gain + self.potential_gain)) > (other.cost + other.depth - (other.gain + other.potential_gain))
+        return self.priority > other.priority
 
     def __ge__(self, other):
-        return (self.cost + self.depth - (self.gain + self.potential_gain)) >= (other.cost + other.depth - (other.gain + other.potential_gain))
+        return self.priority >= other.priority
 
     def __copy__(self):
         cls = self.__class__
@@ -128,6 +156,11 @@ class SearchPath(object):
     def potential_gain(self) -> int:
         return self._search_states[-1].potential_gain
 
+    @property
+    def priority(self) -> int:
+        # search order for BFS...lowest first
+        return self.cost + self.depth - (self.gain + self.potential_gain)
+
     @property
     def last(self):
         return self._search_states[-1]
@@ -140,80 +173,412 @@ class SearchPath(object):
         self._search_states.append(search_state)
         return self
 
+    def extend(self, search_state: S) -> P:
+        return copy(self).add(search_state)
+
 
 P = TypeVar('P', bound=SearchPath)
 
 
+class LinkedSearchPath(object):
+    """
+    persistent search path where each path only points at its parent path, so extending is O(1) and every extension
+    shares its prefix. gain/cost/depth are cached at creation and the full list of states is only built on request
+    """
+    __slots__ = ('_parent', '_last', '_depth', '_gain', '_cost')
+
+    def __init__(self, search_state: S, parent: Optional[LinkedSearchPath] = None):
+        self._parent = parent
+        self._last = search_state
+        self._depth = 1 if parent is None else parent._depth + 1
+        self._gain = search_state.gain
+        self._cost = search_state.cost
+
+    def __str__(self):
+        return f"[{self.gain}:{self.cost}:{self.depth}] (" + ") -> (".join((str(state) for state in self.search_states)) + ")"
+
+    @classmethod
+    def from_search_path(cls, search_path: P) -> LinkedSearchPath:
+        linked = None
+        for search_state in search_path.search_states:
+            linked = cls(search_state, linked)
+        return linked
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    @property
+    def gain(self) -> int:
+        return self._gain
+
+    @property
+    def cost(self) -> int:
+        return self._cost
+
+    @property
+    def completed(self) -> bool:
+        return self._last.completed
+
+    @property
+    def potential_gain(self) -> int:
+        return self._last.potential_gain
+
+    @property
+    def priority(self) -> int:
+        return self._cost + self._depth - (self._gain + self._last.potential_gain)
+
+    @property
+    def last(self):
+        return self._last
+
+    @property
+    def search_states(self) -> List[S]:
+        search_states = []
+        path = self
+        while path is not None:
+            search_states.append(path._last)
+            path = path._parent
+        search_states.reverse()
+        return search_states
+
+    def extend(self, search_state: S) -> LinkedSearchPath:
+        return LinkedSearchPath(search_state, self)
+
+    def to_search_path(self) -> SearchPath:
+        search_states = self.search_states
+        return reduce(lambda path, state: path.add(state), search_states[1:], SearchPath(search_states[0]))
+
+
+class Frontier(ABC):
+    """
+    priority queue of pending search candidates, lowest priority popped first and ties popped in insertion order
+    """
+    @abstractmethod
+    def __len__(self) -> int:
+        raise Exception("implement in subclass")
+
+    @abstractmethod
+    def push(self, priority: int, item: Any, key: Optional[Hashable] = None) -> None:
+        raise Exception("implement in subclass")
+
+    @abstractmethod
+    def pop(self) -> Any:
+        raise Exception("implement in subclass")
+
+
+class HeapFrontier(Frontier):
+    """
+    binary heap of (priority, tiebreak, item) entries so ordering never calls back into the items
+    """
+    def __init__(self):
+        self._heap = []
+        self._order = count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, priority: int, item: Any, key: Optional[Hashable] = None) -> None:
+        heappush(self._heap, (priority, next(self._order), item))
+
+    def pop(self) -> Any:
+        return heappop(self._heap)[2]
+
+
+class BucketFrontier(Frontier):
+    """
+    bucket queue for small integer priorities. one fifo bucket per distinct priority, with only the distinct
+    priorities kept in a heap. push/pop are O(1) into an existing bucket and amortised O(log k) for k distinct queued
+    priorities otherwise, which wins over a plain heap when many candidates share a priority (unit or small edge weights)
+    """
+    def __init__(self):
+        self._buckets: Dict[int, deque] = {}
+        self._priorities = []
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, priority: int, item: Any, key: Optional[Hashable] = None) -> None:
+        bucket = self._buckets.get(priority)
+        if bucket is None:
+            bucket = self._buckets[priority] = deque()
+            heappush(self._priorities, priority)
+        bucket.append(item)
+        self._size += 1
+
+    def pop(self) -> Any:
+        priority = self._priorities[0]
+        bucket = self._buckets[priority]
+        item = bucket.popleft()
+        if len(bucket) == 0:
+            del self._buckets[priority]
+            heappop(self._priorities)
+        self._size -= 1
+        return item
+
+
+class PairingHeapNode(object):
+    __slots__ = ('priority', 'order', 'item', 'key', 'child', 'sibling', 'previous')
+
+    def __init__(self, priority: int, order: int, item: Any, key: Optional[Hashable]):
+        self.priority = priority
+        self.order = order
+        self.item = item
+        self.key = key
+        self.child = None
+        self.sibling = None
+        # parent when node is the first child, otherwise left sibling
+        self.previous = None
+
+    def __lt__(self, other: PairingHeapNode) -> bool:
+        return (self.priority, self.order) < (other.priority, other.order)
+
+
+class PairingHeapFrontier(Frontier):
+    """
+    pairing heap with decrease-key. pushing a key that is already queued with a higher priority moves the existing
+    entry up and replaces its item instead of queueing a duplicate, so stale candidates are never popped
+    """
+    def __init__(self):
+        self._root: Optional[PairingHeapNode] = None
+        self._nodes: Dict[Hashable, PairingHeapNode] = {}
+        self._order = count()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _meld(self, a: Optional[PairingHeapNode], b: Optional[PairingHeapNode]) -> Optional[PairingHeapNode]:
+        if a is None:
+            return b
+        if b is None:
+            return a
+        if b < a:
+            a, b = b, a
+        # b becomes first child of a
+        b.sibling = a.child
+        if a.child is not None:
+            a.child.previous = b
+        b.previous = a
+        a.child = b
+        a.sibling = None
+        a.previous = None
+        return a
+
+    def push(self, priority: int, item: Any, key: Optional[Hashable] = None) -> None:
+        if key is not None and key in self._nodes:
+            node = self._nodes[key]
+            if priority < node.priority:
+                self._decrease(node, priority)
+                node.item = item
+            return
+
+        node = PairingHeapNode(priority, next(self._order), item, key)
+        if key is not None:
+            self._nodes[key] = node
+        self._root = self._meld(self._root, node)
+        self._size += 1
+
+    def _decrease(self, node: PairingHeapNode, priority: int) -> None:
+        node.priority = priority
+        if node is self._root:
+            return
+        # cut node (with its subtree) out of its sibling list and meld it back at the root
+        if node.previous.child is node:
+            node.previous.child = node.sibling
+        else:
+            node.previous.sibling = node.sibling
+        if node.sibling is not None:
+            node.sibling.previous = node.previous
+        node.sibling = None
+        node.previous = None
+        self._root = self._meld(self._root, node)
+
+    def pop(self) -> Any:
+        root = self._root
+        if root.key is not None:
+            del self._nodes[root.key]
+        self._size -= 1
+
+        # two pass pairing of the root's children
+        children = []
+        child = root.child
+        while child is not None:
+            next_child = child.sibling
+            child.sibling = None
+            child.previous = None
+            children.append(child)
+            child = next_child
+        paired = [self._meld(children[i], children[i + 1] if i + 1 < len(children) else None) for i in range(0, len(children), 2)]
+        merged = None
+        for node in reversed(paired):
+            merged = self._meld(node, merged)
+        self._root = merged
+        return root.item
+
+
+class SearchStats(object):
+    """
+    work done by a single search, recorded by every engine and handed to search listeners when the search finishes
+    """
+    def __init__(self, engine: str):
+        self.engine = engine
+        self.expanded = 0
+        self.generated = 0
+        self.pruned: Dict[str, int] = {}
+        self.max_frontier = 0
+        self.peak_visited = 0
+        self.reopened = 0
+        self.wall_time = 0
+
+    def __str__(self):
+        pruned = ", ".join((f"{reason}={count}" for reason, count in self.pruned.items()))
+        return f"{self.engine} : expanded {self.expanded} : generated {self.generated} : pruned [{pruned}] : max frontier {self.max_frontier} : " \
+               f"peak visited {self.peak_visited} : reopened {self.reopened} : {self.wall_time / 1e6:.3f}ms"
+
+    def prune(self, reason: str, count: int = 1) -> None:
+        if count > 0:
+            self.pruned[reason] = self.pruned.get(reason, 0) + count
+
+    def to_dict(self) -> Dict:
+        return {
+            'engine': self.engine,
+            'expanded': self.expanded,
+            'generated': self.generated,
+            'pruned': dict(self.pruned),
+            'max_frontier': self.max_frontier,
+            'peak_visited': self.peak_visited,
+            'reopened': self.reopened,
+            'wall_time_ns': self.wall_time
+        }
+
+
+# callbacks invoked with the stats of every finished search, e.g. so a benchmark runner can record them
+_search_listeners: List[Callable[[SearchStats], None]] = []
+
+
+def add_search_listener(listener: Callable[[SearchStats], None]) -> None:
+    _search_listeners.append(listener)
+
+
+def remove_search_listener(listener: Callable[[SearchStats], None]) -> None:
+    _search_listeners.remove(listener)
+
+
 class DebugMixin(object):
     def __init__(self):
         self._verbose = False
         self._lap = 5000
+        self._stats = None
+
+    @property
+    def stats(self) -> Optional[SearchStats]:
+        # stats of the most recent search
+        return self._stats
 
     def verbose(self, verbose: bool, lap: int) -> DebugMixin:
         self._verbose = verbose
         self._lap = lap
         return self
 
+    def _start_stats(self) -> SearchStats:
+        self._stats = SearchStats(self.__class__.__name__)
+        self._stats.wall_time = perf_counter_ns()
+        return self._stats
+
+    def _finish_stats(self) -> None:
+        self._stats.wall_time = perf_counter_ns() - self._stats.wall_time
+        for listener in _search_listeners:
+            listener(self._stats)
+
 
 class AStar(DebugMixin):
-    def __init__(self, start: S, end: S):
+    def __init__(self, start: S, end: S, frontier: Callable[[], Frontier] = HeapFrontier):
         super().__init__()
         self._start = start
         self._end = end
+        self._frontier = frontier
 
     def find_path(self, ) -> P:
-        scores = {self._start: 0}
+        stats = self._start_stats()
+        # bookkeeping is keyed by fingerprint rather than search state to avoid dispatching through SearchState.__hash__/__eq__
+        end = self._end.fingerprint
+        scores = {self._start.fingerprint: 0}
         shortest_previous = {}
 
-        candidates = PriorityQueue()
-        candidates.put(self._start)
+        candidates = self._frontier()
+        candidates.push(self._start.priority, self._start, self._start.fingerprint)
 
         i = 1
         trimmed = 0
-        while not candidates.empty():
-            candidate: S = candidates.get()
+        generated = 0
+        reopened = 0
+        max_frontier = 1
+        best = SearchPath(self._start)
+        while len(candidates) > 0:
+            candidate: S = candidates.pop()
 
-            if candidate == self._end:
+            if candidate.fingerprint == end:
                 # reached end...build shortest path and return
                 sequence = deque([])
                 current = candidate
-                while current in shortest_previous.keys():
+                while current.fingerprint in shortest_previous:
                     sequence.appendleft(current)
-                    current = shortest_previous[current]
+                    current = shortest_previous[current.fingerprint]
 
-                return reduce(lambda path, state: path.add(state), sequence, SearchPath(self._start))
+                best = reduce(lambda path, state: path.add(state), sequence, SearchPath(self._start))
+                break
 
             # continue search by getting current search state's next states and add to priority queue
             for next_search_state in candidate.next_search_states():
-                if next_search_state not in scores.keys() or next_search_state.cost < scores[next_search_state]:
-                    scores[next_search_state] = next_search_state.cost
-                    shortest_previous[next_search_state] = candidate
-                    candidates.put(next_search_state)
+                generated += 1
+                fingerprint = next_search_state.fingerprint
+                if fingerprint not in scores or next_search_state.cost < scores[fingerprint]:
+                    if fingerprint in scores:
+                        reopened += 1
+                    scores[fingerprint] = next_search_state.cost
+                    shortest_previous[fingerprint] = candidate
+                    candidates.push(next_search_state.priority, next_search_state, fingerprint)
                     continue
 
                 trimmed += 1
 
+            if len(candidates) > max_frontier:
+                max_frontier = len(candidates)
             i += 1
             if self._verbose and i % self._lap == 0:
-                print(f"{i} : ~{candidates.qsize()} : {trimmed}")
-
-        return SearchPath(self._start)
+                print(f"{i} : ~{len(candidates)} : {trimmed}")
+
+        stats.expanded = i - 1
+        stats.generated = generated
+        stats.prune('not_better', trimmed)
+        stats.max_frontier = max_frontier
+        stats.peak_visited = len(scores)
+        stats.reopened = reopened
+        self._finish_stats()
+        return best
 
     def find_all_paths(self) -> List[P]:
-        scores = {self._start: 0}
+        stats = self._start_stats()
+        end = self._end.fingerprint
+        scores = {self._start.fingerprint: 0}
         shortest_previous = {}
         lowest_cost = None
         end_candidate = None
 
-        candidates = PriorityQueue()
-        candidates.put(self._start)
+        candidates = self._frontier()
+        candidates.push(self._start.priority, self._start, self._start.fingerprint)
 
         i = 1
         trimmed = 0
-        while not candidates.empty():
-            candidate: S = candidates.get()
+        generated = 0
+        reopened = 0
+        max_frontier = 1
+        while len(candidates) > 0:
+            candidate: S = candidates.pop()
 
-            if candidate == self._end:
+            if candidate.fingerprint == end:
                 if lowest_cost is None:
                     # encountered first shortest path...record the cost and keep searching until no more paths of equal cost are found
                     lowest_cost = candidate.cost
@@ -226,25 +591,39 @@ class AStar(DebugMixin):
 
             # continue search by getting current search state's next states and add to priority queue
             for next_search_state in candidate.next_search_states():
-                if next_search_state not in scores.keys() or next_search_state.cost <= scores[next_search_state]:
-                    scores[next_search_state] = next_search_state.cost
-                    if next_search_state not in shortest_previous:
-                        shortest_previous[next_search_state] = set([])
-                    shortest_previous[next_search_state].add(candidate)
-                    candidates.put(next_search_state)
+                generated += 1
+                fingerprint = next_search_state.fingerprint
+                if fingerprint not in scores or next_search_state.cost <= scores[fingerprint]:
+                    if fingerprint in scores:
+                        reopened += 1
+                    scores[fingerprint] = next_search_state.cost
+                    if fingerprint not in shortest_previous:
+                        shortest_previous[fingerprint] = set([])
+                    shortest_previous[fingerprint].add(candidate)
+                    candidates.push(next_search_state.priority, next_search_state, fingerprint)
                     continue
                 trimmed += 1
 
+            if len(candidates) > max_frontier:
+                max_frontier = len(candidates)
             i += 1
             if self._verbose and i % self._lap == 0:
-                print(f"{i} : ~{candidates.qsize()} : {trimmed}")
+                print(f"{i} : ~{len(candidates)} : {trimmed}")
+
+        stats.expanded = i - 1
+        stats.generated = generated
+        stats.prune('not_better', trimmed)
+        stats.max_frontier = max_frontier
+        stats.peak_visited = len(scores)
+        stats.reopened = reopened
+        self._finish_stats()
 
         shortest_paths = []
         remaining = deque([[end_candidate]])
         while len(remaining) > 0:
             path = remaining.pop()
-            if path[-1] in shortest_previous:
-                for ns in shortest_previous[path[-1]]:
+            if path[-1].fingerprint in shortest_previous:
+                for ns in shortest_previous[path[-1].fingerprint]:
                     remaining.append(path + [ns])
             else:
                 shortest_paths.append(reduce(lambda p, s: p.add(s), reversed(path[:-1]), SearchPath(path[-1])))
@@ -252,20 +631,26 @@ class AStar(DebugMixin):
 
 
 class BFS(DebugMixin):
-    def __init__(self, start_path: P):
+    def __init__(self, start_path: P, frontier: Callable[[], Frontier] = HeapFrontier):
         super().__init__()
         self._start_path = start_path
+        self._frontier = frontier
 
     def find_path(self) -> P:
+        stats = self._start_stats()
         best = None
 
-        candidates = PriorityQueue()
-        candidates.put(self._start_path)
+        # expand with parent pointer paths and only materialize the winning path
+        start_path = LinkedSearchPath.from_search_path(self._start_path)
+        candidates = self._frontier()
+        candidates.push(start_path.priority, start_path)
 
         i = 1
         trimmed = 0
-        while not candidates.empty():
-            candidate: SearchPath = candidates.get()
+        generated = 0
+        max_frontier = 1
+        while len(candidates) > 0:
+            candidate: LinkedSearchPath = candidates.pop()
 
             # candidate completed its search, check if it is now the current best before continuing search
             if candidate.completed:
@@ -275,17 +660,26 @@ class BFS(DebugMixin):
 
             # continue search by getting current search state's next states and add to priority queue
             for next_search_state in candidate.last.next_search_states():
+                generated += 1
                 if best is not None and next_search_state.gain < best.gain and (next_search_state.potential_gain + next_search_state.gain) < best.gain:
                     trimmed += 1
                     continue
 
-                candidates.put(copy(candidate).add(next_search_state))
+                next_path = candidate.extend(next_search_state)
+                candidates.push(next_path.priority, next_path)
 
+            if len(candidates) > max_frontier:
+                max_frontier = len(candidates)
             i += 1
             if self._verbose and i % self._lap == 0:
-                print(f"{i} : ~{candidates.qsize()} : {trimmed} : " + (f"{best.gain}" + best.last.fingerprint if best is not None else '?'))
+                print(f"{i} : ~{len(candidates)} : {trimmed} : " + (f"{best.gain}{best.last.fingerprint}" if best is not None else '?'))
 
-        return best
+        stats.expanded = i - 1
+        stats.generated = generated
+        stats.prune('bound', trimmed)
+        stats.max_frontier = max_frontier
+        self._finish_stats()
+        return best.to_search_path() if best is not None else None
 
 
 class DFS(DebugMixin):
@@ -295,17 +689,22 @@ class DFS(DebugMixin):
         self._cached = {}
 
     def find_path(self) -> P:
+        stats = self._start_stats()
         best = None
 
         candidates = deque()
-        candidates.append(self._start_path)
+        candidates.append(LinkedSearchPath.from_search_path(self._start_path))
 
-        visited: Dict[S, Tuple[int, int]] = {}
+        visited: Dict[Fingerprint, Tuple[int, int]] = {}
 
         i = 1
-        trimmed = 0
+        bounded = 0
+        dominated = 0
+        generated = 0
+        reopened = 0
+        max_frontier = 1
         while len(candidates) > 0:
-            candidate: SearchPath = candidates.pop()
+            candidate: LinkedSearchPath = candidates.pop()
 
             # candidate completed its search, check if it is now the current best before continuing search
             if candidate.completed:
@@ -315,21 +714,402 @@ class DFS(DebugMixin):
 
             # continue search by getting current search state's next states and add to priority queue
             for next_search_state in candidate.last.next_search_states():
+                generated += 1
                 if best is not None and next_search_state.gain < best.gain and (next_search_state.potential_gain + next_search_state.gain) < best.gain:
-                    trimmed += 1
+                    bounded += 1
                     continue
 
-                if next_search_state in visited and\
-                        (next_search_state.gain < visited[next_search_state][0] or
-                         (next_search_state.gain == visited[next_search_state][0] and next_search_state.cost >= visited[next_search_state][1])):
+                fingerprint = next_search_state.fingerprint
+                if fingerprint in visited:
+                    if next_search_state.gain < visited[fingerprint][0] or \
+                            (next_search_state.gain == visited[fingerprint][0] and next_search_state.cost >= visited[fingerprint][1]):
+                        dominated += 1
+                        continue
+                    reopened += 1
+
+                visited[fingerprint] = (next_search_state.gain, next_search_state.cost)
+                candidates.append(candidate.extend(next_search_state))
+
+            if len(candidates) > max_frontier:
+                max_frontier = len(candidates)
+            i += 1
+            if self._verbose and i % self._lap == 0:
+                print(f"{i} : ~{len(candidates)} : {bounded + dominated} : " + (f"{best.gain}{best.last.fingerprint}" if best is not None else '?'))
+
+        stats.expanded = i - 1
+        stats.generated = generated
+        stats.prune('bound', bounded)
+        stats.prune('visited', dominated)
+        stats.max_frontier = max_frontier
+        stats.peak_visited = len(visited)
+        stats.reopened = reopened
+        self._finish_stats()
+        return best.to_search_path() if best is not None else None
+
+
+class Dijkstra(DebugMixin):
+    """
+    one-to-many search that sweeps outward from start in cost order and records the first (cheapest) state matching each goal
+    """
+    def __init__(self, start: S, frontier: Callable[[], Frontier] = HeapFrontier):
+        super().__init__()
+        self._start = start
+        self._frontier = frontier
+
+    def find_targets(self, goals: Dict[Hashable, Callable[[S], bool]]) -> Dict[Hashable, S]:
+        stats = self._start_stats()
+        found: Dict[Hashable, S] = {}
+        remaining = dict(goals)
+        scores = {self._start.fingerprint: self._start.cost}
+
+        candidates = self._frontier()
+        candidates.push(self._start.cost, self._start, self._start.fingerprint)
+
+        i = 1
+        trimmed = 0
+        stale = 0
+        generated = 0
+        max_frontier = 1
+        while len(candidates) > 0 and len(remaining) > 0:
+            candidate: S = candidates.pop()
+            if candidate.cost > scores[candidate.fingerprint]:
+                # a cheaper copy of this state was already expanded
+                stale += 1
+                continue
+
+            for name, goal in list(remaining.items()):
+                if goal(candidate):
+                    found[name] = candidate
+                    del remaining[name]
+
+            for next_search_state in candidate.next_search_states():
+                generated += 1
+                fingerprint = next_search_state.fingerprint
+                if fingerprint not in scores or next_search_state.cost < scores[fingerprint]:
+                    scores[fingerprint] = next_search_state.cost
+                    candidates.push(next_search_state.cost, next_search_state, fingerprint)
+                    continue
+                trimmed += 1
+
+            if len(candidates) > max_frontier:
+                max_frontier = len(candidates)
+            i += 1
+            if self._verbose and i % self._lap == 0:
+                print(f"{i} : ~{len(candidates)} : {trimmed} : {len(found)}/{len(goals)}")
+
+        stats.expanded = i - 1
+        stats.generated = generated
+        stats.prune('not_better', trimmed)
+        stats.prune('stale', stale)
+        stats.max_frontier = max_frontier
+        stats.peak_visited = len(scores)
+        self._finish_stats()
+        return found
+
+
+def distance_table(starts: Dict[Hashable, S], goals: Dict[Hashable, Callable[[S], bool]], frontier: Callable[[], Frontier] = HeapFrontier) -> Dict[Tuple[Hashable, Hashable], S]:
+    # all-pairs lookup of the cheapest state reaching each goal from each start, using a single sweep per start
+    table = {}
+    for start_name, start in starts.items():
+        for goal_name, state in Dijkstra(start, frontier).find_targets({n: g for n, g in goals.items() if n != start_name}).items():
+            table[(start_name, goal_name)] = state
+    return table
+
+
+class BidirectionalDijkstra(DebugMixin):
+    """
+    single pair shortest cost search growing one frontier from start and one from end until they meet. end is expanded
+    with reverse (defaults to next_search_states, i.e. undirected moves with symmetric costs), and each state's cost is
+    its distance from the side it was expanded from
+    """
+    def __init__(self, start: S, end: S, reverse: Optional[Callable[[S], List[S]]] = None, frontier: Callable[[], Frontier] = HeapFrontier):
+        super().__init__()
+        self._start = start
+        self._end = end
+        self._reverse = reverse if reverse is not None else (lambda state: state.next_search_states())
+        self._frontier = frontier
+        self._meeting = None
+
+    @property
+    def meeting(self) -> Optional[Tuple[S, S]]:
+        # forward and backward states where the cheapest connection was found
+        return self._meeting
+
+    def find_cost(self) -> Optional[int]:
+        stats = self._start_stats()
+        expand = (lambda state: state.next_search_states(), self._reverse)
+        scores = ({self._start.fingerprint: self._start}, {self._end.fingerprint: self._end})
+        candidates = (self._frontier(), self._frontier())
+        candidates[0].push(self._start.cost, self._start, self._start.fingerprint)
+        candidates[1].push(self._end.cost, self._end, self._end.fingerprint)
+        # cost of the last state popped on each side, every remaining candidate on that side costs at least this much
+        reached = [self._start.cost, self._end.cost]
+
+        best = None
+        if self._start.fingerprint == self._end.fingerprint:
+            best = self._start.cost + self._end.cost
+            self._meeting = (self._start, self._end)
+
+        i = 1
+        trimmed = 0
+        stale = 0
+        generated = 0
+        max_frontier = 1
+        while len(candidates[0]) > 0 and len(candidates[1]) > 0:
+            if best is not None and reached[0] + reached[1] >= best:
+                break
+
+            # grow the smaller frontier
+            side = 0 if len(candidates[0]) <= len(candidates[1]) else 1
+            other = 1 - side
+            candidate: S = candidates[side].pop()
+            if candidate.cost > scores[side][candidate.fingerprint].cost:
+                stale += 1
+                continue
+            reached[side] = candidate.cost
+
+            for next_search_state in expand[side](candidate):
+                generated += 1
+                fingerprint = next_search_state.fingerprint
+                if fingerprint in scores[side] and next_search_state.cost >= scores[side][fingerprint].cost:
                     trimmed += 1
                     continue
+                scores[side][fingerprint] = next_search_state
+                candidates[side].push(next_search_state.cost, next_search_state, fingerprint)
 
-                visited[next_search_state] = (next_search_state.gain, next_search_state.cost)
-                candidates.append(copy(candidate).add(next_search_state))
+                if fingerprint in scores[other]:
+                    total = next_search_state.cost + scores[other][fingerprint].cost
+                    if best is None or total < best:
+                        best = total
+                        self._meeting = (next_search_state, scores[other][fingerprint]) if side == 0 else (scores[other][fingerprint], next_search_state)
 
+            if len(candidates[side]) > max_frontier:
+                max_frontier = len(candidates[side])
             i += 1
             if self._verbose and i % self._lap == 0:
-                print(f"{i} : ~{len(candidates)} : {trimmed} : " + (f"{best.gain}" + best.last.fingerprint if best is not None else '?'))
-
+                print(f"{i} : ~{len(candidates[0])}/{len(candidates[1])} : {trimmed} : {best}")
+
+        stats.expanded = i - 1
+        stats.generated = generated
+        stats.prune('not_better', trimmed)
+        stats.prune('stale', stale)
+        stats.max_frontier = max_frontier
+        stats.peak_visited = len(scores[0]) + len(scores[1])
+        self._finish_stats()
         return best
+
+
+class TranspositionTable(object):
+    """
+    bounded fingerprint -> (cost, generation) table. once full, 'lru' evicts the least recently used entry and 'depth'
+    only replaces the entry reached with the highest cost (the shallowest subtree) and only with a cheaper one
+    """
+    def __init__(self, capacity: int, replacement: str = 'lru'):
+        if replacement not in ('lru', 'depth'):
+            raise Exception(f"unsupported replacement policy : {replacement}")
+        self._capacity = capacity
+        self._replacement = replacement
+        self._entries: OrderedDict[Fingerprint, Tuple[int, int]] = OrderedDict()
+        # depth policy only...max-heap of (-cost, serial, fingerprint). updated and evicted entries leave stale items behind
+        # that are skipped when they surface, an item is current only while its serial is the entry's latest
+        self._costliest: List[Tuple[int, int, Fingerprint]] = []
+        self._serials: Dict[Fingerprint, int] = {}
+        self._serial = count()
+        self._peak = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def peak(self) -> int:
+        return self._peak
+
+    def get(self, fingerprint: Fingerprint) -> Optional[Tuple[int, int]]:
+        entry = self._entries.get(fingerprint)
+        if entry is not None and self._replacement == 'lru':
+            self._entries.move_to_end(fingerprint)
+        return entry
+
+    def _track(self, fingerprint: Fingerprint, cost: int) -> None:
+        serial = next(self._serial)
+        self._serials[fingerprint] = serial
+        heappush(self._costliest, (-cost, serial, fingerprint))
+        if len(self._costliest) > 2 * self._capacity + 16:
+            # too many stale items...rebuild from the live entries
+            self._costliest = [(-self._entries[f][0], s, f) for f, s in self._serials.items()]
+            heapify(self._costliest)
+
+    def _worst(self) -> Tuple[int, Fingerprint]:
+        # highest cost entry, dropping stale heap items on the way
+        while True:
+            negative_cost, serial, fingerprint = self._costliest[0]
+            if self._serials.get(fingerprint) == serial:
+                return -negative_cost, fingerprint
+            heappop(self._costliest)
+
+    def put(self, fingerprint: Fingerprint, cost: int, generation: int) -> None:
+        if fingerprint in self._entries or len(self._entries) < self._capacity:
+            self._entries[fingerprint] = (cost, generation)
+            if self._replacement == 'lru':
+                self._entries.move_to_end(fingerprint)
+            else:
+                self._track(fingerprint, cost)
+        elif self._replacement == 'lru':
+            self._entries.popitem(last=False)
+            self._entries[fingerprint] = (cost, generation)
+        else:
+            # depth preferred...the costliest entry is on top of the heap, so each insert into a full table is O(log n)
+            worst_cost, worst = self._worst()
+            if cost < worst_cost:
+                heappop(self._costliest)
+                del self._entries[worst]
+                del self._serials[worst]
+                self._entries[fingerprint] = (cost, generation)
+                self._track(fingerprint, cost)
+        self._peak = max(self._peak, len(self._entries))
+
+
+class IDAStar(DebugMixin):
+    """
+    iterative deepening A*...repeated depth first searches bounded by cost + potential_gain, raising the bound to the
+    smallest value that exceeded it each round. memory is the current path plus a bounded transposition table, so
+    potential_gain must never overestimate and costs must strictly increase along a path
+    """
+    def __init__(self, start: S, end: S, capacity: int = 1_000_000, replacement: str = 'lru'):
+        super().__init__()
+        self._start = start
+        self._end = end
+        self._capacity = capacity
+        self._replacement = replacement
+
+    def find_path(self) -> P:
+        stats = self._start_stats()
+        end = self._end.fingerprint
+        table = TranspositionTable(self._capacity, self._replacement)
+
+        bound = self._start.priority
+        best = None
+        generation = 0
+        i = 1
+        bounded = 0
+        transposed = 0
+        generated = 0
+        max_frontier = 1
+        while best is None and bound is not None:
+            generation += 1
+            next_bound = None
+            path: List[S] = [self._start]
+            children: List[Optional[Iterator[S]]] = [None]
+            while len(path) > 0:
+                state = path[-1]
+                if children[-1] is None:
+                    # first visit of this state in the current round
+                    if state.priority > bound:
+                        bounded += 1
+                        next_bound = state.priority if next_bound is None else min(next_bound, state.priority)
+                        path.pop()
+                        children.pop()
+                        continue
+                    if state.fingerprint == end:
+                        best = reduce(lambda p, s: p.add(s), path[1:], SearchPath(self._start))
+                        break
+                    entry = table.get(state.fingerprint)
+                    if entry is not None and (entry[0] < state.cost or (entry[0] == state.cost and entry[1] == generation)):
+                        transposed += 1
+                        path.pop()
+                        children.pop()
+                        continue
+                    table.put(state.fingerprint, state.cost, generation)
+
+                    next_states = sorted(state.next_search_states(), key=lambda s: s.priority)
+                    generated += len(next_states)
+                    children[-1] = iter(next_states)
+                    i += 1
+                    if self._verbose and i % self._lap == 0:
+                        print(f"{i} : {bound} : ~{len(path)} : {len(table)}")
+
+                next_state = next(children[-1], None)
+                if next_state is None:
+                    path.pop()
+                    children.pop()
+                    continue
+                path.append(next_state)
+                children.append(None)
+                max_frontier = max(max_frontier, len(path))
+            bound = next_bound
+
+        stats.expanded = i - 1
+        stats.generated = generated
+        stats.prune('bound', bounded)
+        stats.prune('transposition', transposed)
+        stats.max_frontier = max_frontier
+        stats.peak_visited = table.peak
+        self._finish_stats()
+        return best if best is not None else SearchPath(self._start)
+
+
+class BeamSearch(DebugMixin):
+    """
+    layer by layer search that only keeps the width lowest cost + potential_gain states of each layer, trading
+    optimality for memory bounded by width and the transposition table capacity
+    """
+    def __init__(self, start: S, end: S, width: int, capacity: int = 1_000_000, replacement: str = 'lru'):
+        super().__init__()
+        self._start = start
+        self._end = end
+        self._width = width
+        self._capacity = capacity
+        self._replacement = replacement
+
+    def find_path(self) -> P:
+        stats = self._start_stats()
+        end = self._end.fingerprint
+        table = TranspositionTable(self._capacity, self._replacement)
+        table.put(self._start.fingerprint, self._start.cost, 0)
+
+        best: Optional[LinkedSearchPath] = None
+        beam = [LinkedSearchPath(self._start)]
+        i = 1
+        depth = 0
+        trimmed = 0
+        narrowed = 0
+        generated = 0
+        max_frontier = 1
+        while len(beam) > 0:
+            depth += 1
+            layer: Dict[Fingerprint, LinkedSearchPath] = {}
+            for candidate in beam:
+                for next_search_state in candidate.last.next_search_states():
+                    generated += 1
+                    fingerprint = next_search_state.fingerprint
+                    if best is not None and next_search_state.priority >= best.cost:
+                        trimmed += 1
+                        continue
+                    entry = table.get(fingerprint)
+                    if entry is not None and entry[0] <= next_search_state.cost:
+                        trimmed += 1
+                        continue
+                    table.put(fingerprint, next_search_state.cost, depth)
+                    next_path = candidate.extend(next_search_state)
+                    if fingerprint == end:
+                        if best is None or next_path.cost < best.cost:
+                            best = next_path
+                        continue
+                    layer[fingerprint] = next_path
+                i += 1
+
+            max_frontier = max(max_frontier, len(layer))
+            beam = sorted(layer.values(), key=lambda p: p.last.priority)
+            narrowed += max(0, len(beam) - self._width)
+            beam = beam[:self._width]
+            if self._verbose and depth % self._lap == 0:
+                print(f"{depth} : {len(beam)} : {len(table)} : {best.cost if best is not None else '?'}")
+
+        stats.expanded = i - 1
+        stats.generated = generated
+        stats.prune('not_better', trimmed)
+        stats.prune('beam', narrowed)
+        stats.max_frontier = max_frontier
+        stats.peak_visited = table.peak
+        self._finish_stats()
+        return best.to_search_path() if best is not None else SearchPath(self._start)
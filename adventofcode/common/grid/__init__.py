@@ -1,25 +1,36 @@
 from __future__ import annotations
-from typing import List
+from array import array
+from bisect import bisect_left
+from typing import Iterable, List, Optional, Tuple
+
+import sys
 
 
 class Point2D(object):
+    # points are dict keys all over the place, so no per-instance __dict__ and a tuple hash that does not collide on grids
+    __slots__ = ('_x', '_y')
+
     def __init__(self, x: int, y: int):
         self._x = x
         self._y = y
 
     def __eq__(self, other):
+        if type(other) is Point2D:
+            return self._x == other._x and self._y == other._y
         return self._x == other.x and self._y == other.y if issubclass(type(other), Point2D) else False
 
     def __ne__(self, other):
-        return self._x != other.x or self._y != other.y if issubclass(type(other), Point2D) else True
+        return not self.__eq__(other)
 
     def __str__(self):
         return "({x}, {y})".format(x=self._x, y=self._y)
 
     def __hash__(self):
-        return self._x * 13 + self._y * 37
+        return hash((self._x, self._y))
 
     def __add__(self, other):
+        if type(other) is Point2D:
+            return Point2D(self._x + other._x, self._y + other._y)
         match other:
             case Point2D():
                 return Point2D(self._x + other.x, self._y + other.y)
@@ -31,6 +42,8 @@ class Point2D(object):
                 raise Exception(f"Unsupported Point2D::add type : {type(other)}")
 
     def __sub__(self, other):
+        if type(other) is Point2D:
+            return Point2D(self._x - other._x, self._y - other._y)
         match other:
             case Point2D():
                 return Point2D(self._x - other.x, self._y - other.y)
@@ -42,6 +55,8 @@ class Point2D(object):
                 raise Exception(f"Unsupported Point2D::sub type : {type(other)}")
 
     def __mul__(self, other):
+        if type(other) is int:
+            return Point2D(self._x * other, self._y * other)
         match other:
             case Point2D():
                 return Point2D(self._x * other.x, self._y * other.y)
@@ -82,26 +97,37 @@ class Point2D(object):
     def y(self):
         return self._y
 
+    def neighbors(self, diagonal: bool = False) -> List[Point2D]:
+        # the 4 orthogonal neighbors, or all 8 with diagonal
+        x, y = self._x, self._y
+        return [Point2D(x + dx, y + dy) for dx, dy in (offsets8 if diagonal else offsets4)]
+
 
 class Point3D(object):
+    __slots__ = ('_x', '_y', '_z')
+
     def __init__(self, x: int, y: int, z: int):
         self._x = x
         self._y = y
         self._z = z
 
     def __eq__(self, other):
+        if type(other) is Point3D:
+            return self._x == other._x and self._y == other._y and self._z == other._z
         return self._x == other.x and self._y == other.y and self._z == other.z if issubclass(type(other), Point3D) else False
 
     def __ne__(self, other):
-        return self._x != other.x or self._y != other.y or self._z != other.z if issubclass(type(other), Point3D) else True
+        return not self.__eq__(other)
 
     def __str__(self):
         return "({x}, {y}, {z})".format(x=self._x, y=self._y, z=self._z)
 
     def __hash__(self):
-        return self._x * 13 + self._y * 37 + self._z * 47
+        return hash((self._x, self._y, self._z))
 
     def __add__(self, other):
+        if type(other) is Point3D:
+            return Point3D(self._x + other._x, self._y + other._y, self._z + other._z)
         match other:
             case Point3D():
                 return Point3D(self._x + other.x, self._y + other.y, self._z + other.z)
@@ -113,6 +139,8 @@ class Point3D(object):
                 raise Exception(f"Unsupported Point3D::add type : {type(other)}")
 
     def __sub__(self, other):
+        if type(other) is Point3D:
+            return Point3D(self._x - other._x, self._y - other._y, self._z - other._z)
         match other:
             case Point3D():
                 return Point3D(self._x - other.x, self._y - other.y, self._z - other.z)
@@ -124,6 +152,8 @@ class Point3D(object):
                 raise Exception(f"Unsupported Point3D::sub type : {type(other)}")
 
     def __mul__(self, other):
+        if type(other) is int:
+            return Point3D(self._x * other, self._y * other, self._z * other)
         match other:
             case Point3D():
                 return Point3D(self._x * other.x, self._y * other.y, self._z * other.z)
@@ -136,7 +166,7 @@ class Point3D(object):
 
     def __floordiv__(self, other):
         match other:
-            case Point2D():
+            case Point3D():
                 return Point3D(self._x // other.x, self._y // other.y, self._z // other.z)
             case tuple():
                 return Point3D(self._x // int(other[0]) or 1, self._y // int(other[1]) or 1, self._z // int(other[2]) or 1)
@@ -147,7 +177,7 @@ class Point3D(object):
 
     def __mod__(self, other):
         match other:
-            case Point2D():
+            case Point3D():
                 return Point3D(self._x % other.x, self._y % other.y, self._z % other.z)
             case tuple():
                 return Point3D(self._x % int(other[0]) or 1, self._y % int(other[1]) or 1, self._z % int(other[2]) or 1)
@@ -168,6 +198,18 @@ class Point3D(object):
     def z(self):
         return self._z
 
+    def neighbors(self, diagonal: bool = False) -> List[Point3D]:
+        # the 6 face neighbors, or all 26 with diagonal
+        x, y, z = self._x, self._y, self._z
+        return [Point3D(x + dx, y + dy, z + dz) for dx, dy, dz in (offsets26 if diagonal else offsets6)]
+
+
+# neighbor offsets as plain tuples, 4/8 for 2D and 6/26 for 3D
+offsets4 = ((0, -1), (1, 0), (0, 1), (-1, 0))
+offsets8 = tuple((dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if (dx, dy) != (0, 0))
+offsets6 = ((1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1))
+offsets26 = tuple((dx, dy, dz) for dz in (-1, 0, 1) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if (dx, dy, dz) != (0, 0, 0))
+
 
 class Grid2D(object):
     def __init__(self, id: int, data: List[List[str]]):
@@ -219,3 +261,256 @@ class Grid2D(object):
     def show(self) -> None:
         for row in self._data:
             print("".join(row))
+
+
+class DenseGrid(object):
+    def __init__(self, width: int, height: int, cells: Optional[bytearray] = None, fill: str = '.'):
+        # one byte per cell in a flat row-major bytearray, so a cell is addressed by its index y * width + x instead of a
+        # hashed Point2D key. neighbor steps are precomputed index offsets paired with the x change to check the row edge
+        self._width = width
+        self._height = height
+        self._cells = cells if cells is not None else bytearray(fill.encode()) * (width * height)
+        if len(self._cells) != width * height:
+            raise Exception(f"Grid of {width}x{height} cannot hold {len(self._cells)} cells")
+        self._steps4 = tuple((dx, dy * width + dx) for dx, dy in offsets4)
+        self._steps8 = tuple((dx, dy * width + dx) for dx, dy in offsets8)
+
+    @classmethod
+    def from_bytes(cls, data: bytes | memoryview) -> DenseGrid:
+        # rows of the raw input joined in a single pass, line endings dropped
+        rows = bytes(data).splitlines()
+        while len(rows) > 0 and len(rows[-1]) == 0:
+            rows.pop()
+        width = len(rows[0]) if len(rows) > 0 else 0
+        if any(len(row) != width for row in rows):
+            raise Exception(f"Grid rows are not all {width} wide")
+        return cls(width, len(rows), bytearray(b''.join(rows)))
+
+    @classmethod
+    def from_lines(cls, lines: List[str]) -> DenseGrid:
+        return cls.from_bytes("\n".join(lines).encode())
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    @property
+    def cells(self) -> bytearray:
+        return self._cells
+
+    def __len__(self):
+        return len(self._cells)
+
+    def __getitem__(self, index: int) -> str:
+        return chr(self._cells[index])
+
+    def __setitem__(self, index: int, value: str) -> None:
+        self._cells[index] = ord(value)
+
+    def index(self, x: int, y: int) -> int:
+        return y * self._width + x
+
+    def position(self, index: int) -> Tuple[int, int]:
+        y, x = divmod(index, self._width)
+        return x, y
+
+    def point(self, index: int) -> Point2D:
+        y, x = divmod(index, self._width)
+        return Point2D(x, y)
+
+    def index_of(self, point: Point2D) -> int:
+        return point.y * self._width + point.x
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self._width and 0 <= y < self._height
+
+    def get(self, x: int, y: int, default: Optional[str] = None) -> Optional[str]:
+        return chr(self._cells[y * self._width + x]) if 0 <= x < self._width and 0 <= y < self._height else default
+
+    def set(self, x: int, y: int, value: str) -> None:
+        self._cells[y * self._width + x] = ord(value)
+
+    def step(self, index: int, dx: int, dy: int) -> Optional[int]:
+        # index one step of (dx, dy) away, None when that leaves the grid
+        x = index % self._width + dx
+        y = index // self._width + dy
+        return y * self._width + x if 0 <= x < self._width and 0 <= y < self._height else None
+
+    def neighbors(self, index: int, diagonal: bool = False) -> List[int]:
+        # indexes of the 4 orthogonal neighbors, or all 8 with diagonal, that are inside the grid
+        x = index % self._width
+        size = len(self._cells)
+        return [
+            index + offset for dx, offset in (self._steps8 if diagonal else self._steps4)
+            if 0 <= x + dx < self._width and 0 <= index + offset < size
+        ]
+
+    def row(self, y: int) -> memoryview:
+        return memoryview(self._cells)[y * self._width:(y + 1) * self._width]
+
+    def column(self, x: int) -> bytes:
+        return bytes(self._cells[x::self._width])
+
+    def find(self, value: str, start: int = 0) -> int:
+        # first index holding value at or after start, -1 if there is none
+        return self._cells.find(ord(value), start)
+
+    def find_all(self, value: str) -> List[int]:
+        found = []
+        index = self._cells.find(ord(value))
+        while index >= 0:
+            found.append(index)
+            index = self._cells.find(ord(value), index + 1)
+        return found
+
+    def count(self, value: str) -> int:
+        return self._cells.count(ord(value))
+
+    def copy(self) -> DenseGrid:
+        return DenseGrid(self._width, self._height, bytearray(self._cells))
+
+    def show(self) -> None:
+        for y in range(self._height):
+            print(self.row(y).tobytes().decode())
+
+
+# translate table for whole-slice toggles of 0/1 cell levels
+_toggle_table = bytes([1 if v == 0 else 0 for v in range(256)])
+_lane_formats = {1: 'B', 2: 'H', 4: 'I', 8: 'Q'}
+
+
+class RectangleGrid(object):
+    def __init__(self, width: int, height: int, xs: Optional[List[int]] = None, ys: Optional[List[int]] = None):
+        # cells are one bytearray per row, each cell a little endian lane of self._lane bytes, so every update is a slice
+        # operation. on/off/toggle fill or translate the slice. add reads the slice as one int and adjusts every lane at
+        # once (swar), which needs the top bit of each lane clear, so lanes start at a byte and are doubled only when a
+        # level would overflow. with xs/ys given the grid is coordinate compressed: column i covers x in [xs[i], xs[i + 1])
+        # and row j covers y in [ys[j], ys[j + 1])
+        self._width = width
+        self._height = height
+        self._xs = xs
+        self._ys = ys
+        self._columns = width if xs is None else len(xs) - 1
+        rows = height if ys is None else len(ys) - 1
+        self._rows = [bytearray(self._columns) for _ in range(rows)]
+        self._lane = 1
+        # upper bound on every level, tightened by a scan before widening
+        self._ceiling = 0
+
+    @classmethod
+    def compressed(cls, width: int, height: int, rectangles: Iterable[Tuple[int, int, int, int]]) -> RectangleGrid:
+        # only the edges of the (inclusive) rectangles that will be applied matter, so cells between them are merged
+        xs = {0, width}
+        ys = {0, height}
+        for x1, y1, x2, y2 in rectangles:
+            xs.update((x1, x2 + 1))
+            ys.update((y1, y2 + 1))
+        return cls(width, height, sorted(xs), sorted(ys))
+
+    def _span(self, start: int, end: int, edges: Optional[List[int]]) -> Tuple[int, int]:
+        # inclusive coordinates to a slice over (possibly compressed) cells
+        if edges is None:
+            return start, end + 1
+        return bisect_left(edges, start), bisect_left(edges, end + 1)
+
+    def _update(self, x1: int, y1: int, x2: int, y2: int, table: Optional[bytes], fill: Optional[int] = None) -> None:
+        left, right = self._span(x1, x2, self._xs)
+        top, bottom = self._span(y1, y2, self._ys)
+        lane = self._lane
+        if fill is not None:
+            self._ceiling = max(self._ceiling, fill)
+            filled = (bytes([fill]) + bytes(lane - 1)) * (right - left)
+            for row in self._rows[top:bottom]:
+                row[left * lane:right * lane] = filled
+        else:
+            self._ceiling = max(self._ceiling, 1)
+            # 0/1 levels only live in the low byte of each lane
+            for row in self._rows[top:bottom]:
+                row[left * lane:right * lane:lane] = row[left * lane:right * lane:lane].translate(table)
+
+    def turn_on(self, x1: int, y1: int, x2: int, y2: int) -> None:
+        self._update(x1, y1, x2, y2, None, 1)
+
+    def turn_off(self, x1: int, y1: int, x2: int, y2: int) -> None:
+        self._update(x1, y1, x2, y2, None, 0)
+
+    def toggle(self, x1: int, y1: int, x2: int, y2: int) -> None:
+        self._update(x1, y1, x2, y2, _toggle_table)
+
+    def _levels(self, row: bytearray) -> array:
+        levels = array(_lane_formats[self._lane])
+        levels.frombytes(row)
+        if sys.byteorder == 'big':
+            levels.byteswap()
+        return levels
+
+    def _widen(self, ceiling: int) -> None:
+        # doubles the lanes until the top bit of each one stays clear of the given level. the old lane becomes the low
+        # half of the new one, copied a byte column at a time
+        lane = self._lane
+        while ceiling >> (8 * lane - 1):
+            lane *= 2
+        if lane > 8:
+            raise Exception(f"Level {ceiling} does not fit in a 64 bit cell")
+        for y, row in enumerate(self._rows):
+            wide = bytearray(self._columns * lane)
+            for i in range(self._lane):
+                wide[i::lane] = row[i::self._lane]
+            self._rows[y] = wide
+        self._lane = lane
+
+    def add(self, x1: int, y1: int, x2: int, y2: int, delta: int) -> None:
+        # levels never go below 0
+        bits = 8 * self._lane
+        if delta > 0 and (self._ceiling + delta) >> (bits - 1):
+            self._ceiling = max(max(self._levels(row), default=0) for row in self._rows)
+            if (self._ceiling + delta) >> (bits - 1):
+                self._widen(self._ceiling + delta)
+                bits = 8 * self._lane
+        left, right = self._span(x1, x2, self._xs)
+        top, bottom = self._span(y1, y2, self._ys)
+        start, end = left * self._lane, right * self._lane
+        # a 1 in the low bit of every lane of the slice
+        ones = int.from_bytes((b'\x01' + bytes(self._lane - 1)) * (right - left), 'little')
+        if delta > 0:
+            self._ceiling += delta
+            step = delta * ones
+            for row in self._rows[top:bottom]:
+                row[start:end] = (int.from_bytes(row[start:end], 'little') + step).to_bytes(end - start, 'little')
+            return
+
+        k = min(-delta, (1 << (bits - 1)) - 1)
+        # adding 2^(bits - 1) - k to a lane sets its top bit exactly when the level is at least k
+        bias = ((1 << (bits - 1)) - k) * ones
+        top_bits = ones << (bits - 1)
+        for row in self._rows[top:bottom]:
+            levels = int.from_bytes(row[start:end], 'little')
+            at_least = ((levels + bias) & top_bits) >> (bits - 1)
+            keep = (at_least << bits) - at_least
+            levels = (levels & keep) - k * at_least
+            row[start:end] = levels.to_bytes(end - start, 'little')
+
+    def _weights(self, edges: Optional[List[int]], size: int) -> List[int]:
+        return [1] * size if edges is None else [edges[i + 1] - edges[i] for i in range(len(edges) - 1)]
+
+    def count(self) -> int:
+        # number of cells with a non-zero level
+        rows = [self._levels(row) for row in self._rows]
+        if self._xs is None and self._ys is None:
+            return sum(len(row) - row.count(0) for row in rows)
+        widths = self._weights(self._xs, self._width)
+        heights = self._weights(self._ys, self._height)
+        return sum(h * sum(w for v, w in zip(row, widths) if v) for row, h in zip(rows, heights))
+
+    def total(self) -> int:
+        # sum of all cell levels
+        rows = [self._levels(row) for row in self._rows]
+        if self._xs is None and self._ys is None:
+            return sum(sum(row) for row in rows)
+        widths = self._weights(self._xs, self._width)
+        heights = self._weights(self._ys, self._height)
+        return sum(h * sum(v * w for v, w in zip(row, widths)) for row, h in zip(rows, heights))
@@ -0,0 +1,131 @@
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Deque, Generic, Iterator, List, Optional, Tuple, TypeVar
+
+import hashlib
+import os
+
+
+def mine_chunk(key: bytes, zeros: int, start: int, end: int) -> List[Tuple[int, bytes]]:
+    # every index in [start, end) whose md5(key + index) starts with the given number of zero hex digits, ascending
+    prefix = hashlib.md5(key)
+    full, half = divmod(zeros, 2)
+    target = bytes(full)
+    hits = []
+    for i in range(start, end):
+        md5 = prefix.copy()
+        md5.update(b'%d' % i)
+        digest = md5.digest()
+        if digest[:full] == target and (half == 0 or digest[full] < 0x10):
+            hits.append((i, digest))
+    return hits
+
+
+class NonceMiner(object):
+    def __init__(self, key: str, zeros: int, chunk_size: int = 100_000, workers: Optional[int] = 1):
+        # mines in process by default so it does not nest a pool inside the batch runner's workers. a process pool is
+        # opt in with workers > 1 (None for one per cpu)
+        self._key = key.encode('utf-8')
+        self._zeros = zeros
+        self._chunk_size = chunk_size
+        self._workers = workers if workers is not None else (os.cpu_count() or 1)
+
+    def hits(self, start: int = 0) -> Iterator[Tuple[int, bytes]]:
+        # (index, digest) of every hit from start onwards in ascending index order. with a pool, chunks of the index space
+        # are hashed ahead of the consumer but always handed back in order, so results do not depend on timing
+        if self._workers == 1:
+            while True:
+                yield from mine_chunk(self._key, self._zeros, start, start + self._chunk_size)
+                start += self._chunk_size
+
+        executor = ProcessPoolExecutor(max_workers=self._workers)
+        pending: Deque[Future] = deque([])
+        try:
+            while True:
+                while len(pending) < 2 * self._workers:
+                    pending.append(executor.submit(mine_chunk, self._key, self._zeros, start, start + self._chunk_size))
+                    start += self._chunk_size
+                yield from pending.popleft().result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def first(self, start: int = 0) -> Tuple[int, bytes]:
+        hits = self.hits(start)
+        try:
+            return next(hits)
+        finally:
+            hits.close()
+
+
+T = TypeVar('T')
+
+
+def stretched_md5(salt: bytes, index: int, stretch: int = 0) -> str:
+    # hex md5 of salt + index, re-hashed as hex another stretch times
+    digest = hashlib.md5(salt + b'%d' % index).hexdigest()
+    for _ in range(stretch):
+        digest = hashlib.md5(digest.encode()).hexdigest()
+    return digest
+
+
+def hash_batch(salt: bytes, start: int, end: int, stretch: int, summarize: Optional[Callable[[str], T]]) -> List[T]:
+    # summarize runs in the worker so only the compact per-index result crosses the process boundary
+    if summarize is None:
+        return [stretched_md5(salt, i, stretch) for i in range(start, end)]
+    return [summarize(stretched_md5(salt, i, stretch)) for i in range(start, end)]
+
+
+class HashStream(Generic[T]):
+    def __init__(self, salt: str, stretch: int = 0, summarize: Optional[Callable[[str], T]] = None, batch_size: int = 1000, workers: Optional[int] = 1):
+        # per-index (optionally summarized) hashes, produced in batches ahead of the reader. batches are hashed in process
+        # by default; a process pool is opt in with workers > 1 (None for one per cpu), is only started on the first batch
+        # and summarize must then be picklable
+        self._salt = salt.encode('utf-8')
+        self._stretch = stretch
+        self._summarize = summarize
+        self._batch_size = batch_size
+        self._workers = workers if workers is not None else (os.cpu_count() or 1)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: Deque[Future] = deque([])
+        self._next = 0
+        # sliding window of results for indexes [base, base + len(window))
+        self._window: Deque[T] = deque([])
+        self._base = 0
+
+    def __getitem__(self, index: int) -> T:
+        if index < self._base:
+            raise Exception(f"Hash at {index} has already been evicted (window starts at {self._base})")
+        while index >= self._base + len(self._window):
+            self._window.extend(self._next_batch())
+        return self._window[index - self._base]
+
+    def evict(self, index: int) -> None:
+        # forgets every index below the given one
+        while self._base < index and len(self._window) > 0:
+            self._window.popleft()
+            self._base += 1
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._pending.clear()
+
+    def __enter__(self) -> HashStream[T]:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _next_batch(self) -> List[T]:
+        if self._workers == 1:
+            self._next += self._batch_size
+            return hash_batch(self._salt, self._next - self._batch_size, self._next, self._stretch, self._summarize)
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers)
+        while len(self._pending) < 2 * self._workers:
+            self._pending.append(self._executor.submit(hash_batch, self._salt, self._next, self._next + self._batch_size, self._stretch, self._summarize))
+            self._next += self._batch_size
+        return self._pending.popleft().result()
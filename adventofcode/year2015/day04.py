@@ -1,6 +1,5 @@
 from adventofcode.common import Solution
-
-import hashlib
+from adventofcode.common.hashing import NonceMiner
 
 
 class Day04(Solution):
@@ -9,13 +8,9 @@ class Day04(Solution):
 
         self._key = self._load_input_as_string()
 
-    def _mine(self, l):
-        pattern = '0'*l
-        i = 0
-        while True:
-            i += 1
-            if hashlib.md5((self._key + str(i)).encode('utf-8')).hexdigest()[0:l] == pattern:
-                break
+    def _mine(self, l, workers: int = 1):
+        # mined in process unless workers asks for a pool
+        i, _ = NonceMiner(self._key, l, workers=workers).first(1)
         return i
 
     def part_one(self):
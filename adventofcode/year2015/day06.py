@@ -1,4 +1,5 @@
 from adventofcode.common import Solution
+from adventofcode.common.grid import RectangleGrid
 
 import re
 
@@ -9,9 +10,6 @@ class Day06(Solution):
 
         self._instructions = list(map(lambda l: self._parse_instruction(l), self._load_input_as_lines()))
 
-        self._light_grid = [[False for x in range(1000)] for x in range(1000)]
-        self._brightness_grid = [[0 for x in range(1000)] for x in range(1000)]
-
     def _parse_instruction(self, s):
         r = re.match(r"([a-z\s]+) (\d+),(\d+) through (\d+),(\d+)", s)
         if r is None:
@@ -20,41 +18,24 @@ class Day06(Solution):
         # parse instructions into tuple of command, starting x, starting y, ending x, and ending y
         return r.group(1).replace(' ', '_'), int(r.group(2)), int(r.group(3)), int(r.group(4)), int(r.group(5))
 
-    # commands for light grid
-    def _light_turn_on(self, x, y):
-        self._light_grid[x][y] = True
-
-    def _light_turn_off(self, x, y):
-        self._light_grid[x][y] = False
-
-    def _light_toggle(self, x, y):
-        self._light_grid[x][y] = not self._light_grid[x][y]
-
-    # commands for brightness grid
-    def _brightness_turn_on(self, x, y):
-        self._brightness_grid[x][y] += 1
-
-    def _brightness_turn_off(self, x, y):
-        self._brightness_grid[x][y] -= 1
-
-        if self._brightness_grid[x][y] < 0:
-            self._brightness_grid[x][y] = 0
-
-    def _brightness_toggle(self, x, y):
-        self._brightness_grid[x][y] += 2
-
     def part_one(self):
+        # coordinate compressed so only the distinct rectangle edges are materialised
+        grid = RectangleGrid.compressed(1000, 1000, ((x1, y1, x2, y2) for _, x1, y1, x2, y2 in self._instructions))
         for (command, startx, starty, endx, endy) in self._instructions:
-            for x in range(startx, endx + 1):
-                for y in range(starty, endy + 1):
-                    getattr(self, '_' + 'light_' + command)(x, y)
+            match command:
+                case 'turn_on':
+                    grid.turn_on(startx, starty, endx, endy)
+                case 'turn_off':
+                    grid.turn_off(startx, starty, endx, endy)
+                case 'toggle':
+                    grid.toggle(startx, starty, endx, endy)
 
-        return sum((self._light_grid[x][y] for x in range(1000) for y in range(1000)))
+        return grid.count()
 
     def part_two(self):
+        grid = RectangleGrid.compressed(1000, 1000, ((x1, y1, x2, y2) for _, x1, y1, x2, y2 in self._instructions))
+        brightness = {'turn_on': 1, 'turn_off': -1, 'toggle': 2}
         for (command, startx, starty, endx, endy) in self._instructions:
-            for x in range(startx, endx + 1):
-                for y in range(starty, endy + 1):
-                    getattr(self, '_' + 'brightness_' + command)(x, y)
+            grid.add(startx, starty, endx, endy, brightness[command])
 
-        return sum((self._brightness_grid[x][y] for x in range(1000) for y in range(1000)))
+        return grid.total()
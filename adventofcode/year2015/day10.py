@@ -1,4 +1,82 @@
 from adventofcode.common import Solution
+from collections import Counter
+from itertools import groupby
+from typing import Dict, List, Optional, Tuple
+
+
+def encode_runs(digits: str) -> List[Tuple[int, int]]:
+    # run-length encoding as (count, digit) pairs
+    return [(sum(1 for _ in run), int(digit)) for digit, run in groupby(digits)]
+
+
+def look_and_say(digits: str) -> str:
+    return "".join(f"{count}{digit}" for count, digit in encode_runs(digits))
+
+
+class LookAndSay(object):
+    def __init__(self, horizon: int = 12):
+        # how many generations ahead a split point is checked for. the first digit of a sequence settles into a short
+        # cycle within a handful of generations so this is comfortably past where a boundary could still merge
+        self._horizon = horizon
+        self._decay: Dict[str, List[str]] = {}
+        self._leading: Dict[str, List[Optional[int]]] = {}
+
+    def _leading_digits(self, digits: str) -> List[Optional[int]]:
+        # first digit of each of the next horizon generations, computed on a bounded prefix. the last run of a truncated
+        # prefix may be incomplete so its output is dropped each generation. None once the prefix runs out
+        key = digits[:17]
+        if key not in self._leading:
+            leading = []
+            prefix = digits[:16]
+            truncated = len(prefix) < len(digits)
+            for _ in range(self._horizon + 1):
+                if len(prefix) == 0:
+                    leading.append(None)
+                    break
+                leading.append(int(prefix[0]))
+                runs = encode_runs(prefix)
+                if truncated:
+                    runs = runs[:-1]
+                prefix = "".join(f"{count}{digit}" for count, digit in runs)
+                truncated = truncated or len(prefix) > 16
+                prefix = prefix[:16]
+            self._leading[key] = leading
+        return self._leading[key]
+
+    def split(self, digits: str) -> List[str]:
+        # splits into parts that evolve independently. L|R never interact as long as the last digit of L, which every
+        # generation keeps, differs from the first digit of every later generation of R
+        parts = []
+        start = 0
+        for i in range(1, len(digits)):
+            if digits[i] == digits[i - 1]:
+                continue
+            last = int(digits[i - 1])
+            if all(d is not None and d != last for d in self._leading_digits(digits[i:])):
+                parts.append(digits[start:i])
+                start = i
+        parts.append(digits[start:])
+        return parts
+
+    def decay(self, element: str) -> List[str]:
+        # what an element becomes after one generation, memoised. for Conway's 92 atomic elements this is the decay table
+        if element not in self._decay:
+            self._decay[element] = self.split(look_and_say(element))
+        return self._decay[element]
+
+    def elements(self, digits: str, iterations: int) -> Counter:
+        # element counts after the given number of generations, without ever building the full sequence
+        counts = Counter(self.split(digits))
+        for _ in range(iterations):
+            next_counts = Counter()
+            for element, count in counts.items():
+                for child in self.decay(element):
+                    next_counts[child] += count
+            counts = next_counts
+        return counts
+
+    def length(self, digits: str, iterations: int) -> int:
+        return sum(len(element) * count for element, count in self.elements(digits, iterations).items())
 
 
 class Day10(Solution):
@@ -6,35 +84,10 @@ class Day10(Solution):
         super().__init__(year, day)
 
         self._start = self._load_input_as_lines()[0]
-
-    def _do_look_say(self, number):
-        response = ''
-
-        i = 0
-        current_digit_count = 1
-        current_digit = number[i]
-        while i < len(number) - 1:
-            i += 1
-            if number[i] == current_digit:
-                # current digit is repeating, so increment counters
-                current_digit_count += 1
-            else:
-                # current digit changed, so write it out and keep track of new
-                response += str(current_digit_count) + current_digit
-                current_digit_count = 1
-                current_digit = number[i]
-        response += str(current_digit_count) + current_digit
-
-        return response
-
-    def _get_next_look_say(self, number, iteration):
-        if iteration > 1:
-            return self._get_next_look_say(self._do_look_say(number), iteration - 1)
-        else:
-            return self._do_look_say(number)
+        self._look_and_say = LookAndSay()
 
     def part_one(self,):
-        return len(self._get_next_look_say(self._start, 40))
+        return self._look_and_say.length(self._start, 40)
 
     def part_two(self):
-        return len(self._get_next_look_say(self._start, 50))
+        return self._look_and_say.length(self._start, 50)
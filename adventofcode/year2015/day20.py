@@ -1,4 +1,43 @@
 from adventofcode.common import Solution
+from array import array
+from math import isqrt
+from typing import Optional
+
+
+def first_house(target: int, gift_factor: int, house_limit: Optional[int] = None, chunk_size: int = 1 << 17) -> int:
+    # divisor-sum sieve over fixed size chunks of houses so memory stays flat. house n gets at least gift_factor * n from
+    # elf n, which bounds the search
+    needed = -(-target // gift_factor)
+    for low in range(1, needed + 1, chunk_size):
+        high = min(low + chunk_size, needed + 1)
+        presents = array('I', bytes(4 * (high - low)))
+        # elves up to sqrt(high) visit many houses in the chunk, one strided slice per elf. with a house limit, elves
+        # below low / house_limit have stopped delivering before this chunk
+        split = max(1, isqrt(high))
+        first_elf = 1 if house_limit is None else max(1, low // house_limit)
+        for elf in range(first_elf, min(split, high)):
+            start = max(elf, -(-low // elf) * elf)
+            end = high if house_limit is None else min(high, elf * house_limit + 1)
+            if start < end:
+                visited = slice(start - low, end - low, elf)
+                presents[visited] = array('I', map(elf.__add__, presents[visited]))
+
+        # the remaining elves visit at most sqrt(high) houses each, so go by visit number instead. the k-th visits of consecutive
+        # elves are k houses apart and add consecutive elf numbers
+        for k in range(1, (high - 1) // split + 1):
+            if house_limit is not None and k > house_limit:
+                break
+            first = max(split, -(-low // k))
+            last = (high - 1) // k
+            if first <= last:
+                visited = slice(first * k - low, last * k - low + 1, k)
+                presents[visited] = array('I', map(int.__add__, presents[visited], range(first, last + 1)))
+
+        for i, p in enumerate(presents):
+            if p >= needed:
+                return low + i
+
+    raise Exception(f"No house gets {target} presents")
 
 
 class Day20(Solution):
@@ -7,49 +46,8 @@ class Day20(Solution):
 
         self._number = int(self._load_input_as_string())
 
-    def _get_factors_sum(self, n, gift_factor, house_limit):
-        factors = set([])
-        for i in range(1, int(n**0.5) + 1):
-            if n % i == 0:
-                if house_limit == 0 or i * house_limit >= n:
-                    factors.add(i)
-                    factors.add(n / i)
-                else:
-                    if (n / i ) * house_limit >= n:
-                        factors.add(n / i)
-
-        return (sum([i for i in factors]) * gift_factor)
-
     def part_one(self):
-        i = 1
-        largest = 0
-        while True:
-            fsum = self._get_factors_sum(i, 10, 0)
-
-            if largest < fsum:
-                largest = fsum
-            #print(str(i) + ' : ' + str(largest))
-
-            if fsum >= self._number:
-                break
-
-            i += 1
-
-        return i
+        return first_house(self._number, 10)
 
     def part_two(self):
-        i = 1
-        largest = 0
-        while True:
-            fsum = self._get_factors_sum(i, 11, 50)
-
-            if largest < fsum:
-                largest = fsum
-            #print(str(i) + ' : ' + str(largest))
-
-            if fsum >= self._number:
-                break
-
-            i += 1
-
-        return i
+        return first_house(self._number, 11, 50)
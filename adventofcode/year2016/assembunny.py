@@ -0,0 +1,226 @@
+from __future__ import annotations
+from typing import Callable, List, Optional, Tuple
+
+
+registers = ('a', 'b', 'c', 'd')
+
+# source operations
+CPY, INC, DEC, JNZ, TGL, OUT = range(6)
+# fused operations produced by the peephole pass
+ADD, MUL, DIVMOD = range(6, 9)
+
+operations = {'cpy': CPY, 'inc': INC, 'dec': DEC, 'jnz': JNZ, 'tgl': TGL, 'out': OUT}
+
+# (operation, x is register, x, y is register, y) where a register operand is its index into the register file
+Instruction = Tuple[int, bool, int, bool, int]
+
+
+def assemble(lines: List[str]) -> List[Instruction]:
+    program = []
+    for line in lines:
+        name, *operands = line.split()
+        if name not in operations:
+            raise Exception(f"Unrecognized instruction : {line}")
+        encoded = []
+        for operand in operands:
+            encoded.extend((True, registers.index(operand)) if operand in registers else (False, int(operand)))
+        encoded.extend([False, 0] * (2 - len(operands)))
+        program.append((operations[name], *encoded))
+    return program
+
+
+def toggle(instruction: Instruction) -> Instruction:
+    operation, xr, x, yr, y = instruction
+    if operation in (CPY, JNZ):
+        return (JNZ if operation == CPY else CPY, xr, x, yr, y)
+    return (DEC if operation == INC else INC, xr, x, yr, y)
+
+
+def _add_loop(program: List[Instruction], i: int) -> Optional[Tuple[int, int]]:
+    # inc target / dec counter / jnz counter -2, in either order, adds counter to target and clears counter
+    if i + 2 >= len(program):
+        return None
+    first, second, jump = program[i:(i + 3)]
+    if not (jump[0] == JNZ and jump[1] and not jump[3] and jump[4] == -2 and first[1] and second[1]):
+        return None
+    if first[0] == INC and second[0] == DEC and second[2] == jump[2] and first[2] != second[2]:
+        return first[2], second[2]
+    if first[0] == DEC and second[0] == INC and first[2] == jump[2] and first[2] != second[2]:
+        return second[2], first[2]
+    return None
+
+
+def _multiply_loop(program: List[Instruction], i: int) -> Optional[Instruction]:
+    # cpy source inner / add loop of inner into target / dec outer / jnz outer -5 adds source * outer to target
+    if i + 5 >= len(program):
+        return None
+    copy, outer, jump = program[i], program[i + 4], program[i + 5]
+    add = _add_loop(program, i + 1)
+    if add is None or copy[0] != CPY or not copy[3] or copy[4] != add[1]:
+        return None
+    if not (outer[0] == DEC and outer[1] and jump[0] == JNZ and jump[1] and jump[2] == outer[2] and not jump[3] and jump[4] == -5):
+        return None
+    target, inner, counter = add[0], add[1], outer[2]
+    if counter in (target, inner) or (copy[1] and copy[2] in (target, inner, counter)):
+        return None
+    return (MUL, copy[1], copy[2], target, inner, counter)
+
+
+def _divmod_loop(program: List[Instruction], i: int) -> Optional[Instruction]:
+    # cpy divisor remainder / jnz dividend 2 / jnz 1 6 / dec dividend / dec remainder / jnz remainder -4 / inc quotient / jnz 1 -7
+    # adds dividend // divisor to quotient, leaves divisor - dividend % divisor in remainder and clears dividend
+    if i + 7 >= len(program):
+        return None
+    copy, test, leave, dividend, remainder, inner, quotient, outer = program[i:(i + 8)]
+    if not (copy[0] == CPY and not copy[1] and copy[2] > 0 and copy[3]):
+        return None
+    if not (test[0] == JNZ and test[1] and not test[3] and test[4] == 2 and leave[0] == JNZ and not leave[1] and leave[2] != 0 and not leave[3] and leave[4] == 6):
+        return None
+    if not (dividend[0] == DEC and dividend[1] and dividend[2] == test[2] and remainder[0] == DEC and remainder[1] and remainder[2] == copy[4]):
+        return None
+    if not (inner[0] == JNZ and inner[1] and inner[2] == copy[4] and not inner[3] and inner[4] == -4 and quotient[0] == INC and quotient[1]):
+        return None
+    if not (outer[0] == JNZ and not outer[1] and outer[2] != 0 and not outer[3] and outer[4] == -7):
+        return None
+    if len({test[2], copy[4], quotient[2]}) < 3:
+        return None
+    return (DIVMOD, copy[2], test[2], copy[4], quotient[2])
+
+
+def optimize(program: List[Instruction]) -> List[tuple]:
+    # replaces the first instruction of every recognised loop with a fused operation. the loop body stays in place so
+    # jumps into the middle of it, and fused operations whose guard fails at runtime, still execute the original code
+    optimized: List[tuple] = list(program)
+    for i in range(len(program)):
+        fused = _divmod_loop(program, i) or _multiply_loop(program, i)
+        if fused is None:
+            add = _add_loop(program, i)
+            fused = (ADD, *add) if add is not None else None
+        if fused is not None:
+            optimized[i] = fused
+    return optimized
+
+
+class AssembunnyVM(object):
+    def __init__(self, instructions: List[str]):
+        self._source = assemble(instructions)
+        self._program = optimize(self._source)
+        self._registers = [0, 0, 0, 0]
+        self._ip = 0
+        self._verbose = False
+
+    @property
+    def a(self):
+        return self._registers[0]
+
+    @a.setter
+    def a(self, value: int):
+        self._registers[0] = value
+
+    @property
+    def b(self):
+        return self._registers[1]
+
+    @b.setter
+    def b(self, value: int):
+        self._registers[1] = value
+
+    @property
+    def c(self):
+        return self._registers[2]
+
+    @c.setter
+    def c(self, value: int):
+        self._registers[2] = value
+
+    @property
+    def d(self):
+        return self._registers[3]
+
+    @d.setter
+    def d(self, value: int):
+        self._registers[3] = value
+
+    @property
+    def state(self) -> Tuple[int, Tuple[int, ...]]:
+        # instruction pointer and registers, enough to recognise a repeating execution as long as no tgl has run
+        return self._ip, tuple(self._registers)
+
+    def verbose(self, toggle: bool) -> None:
+        self._verbose = toggle
+
+    def run(self, on_output: Optional[Callable[[int], bool]] = None) -> None:
+        # runs until the instruction pointer leaves the program, or until on_output returns False for a value sent by out
+        source = self._source
+        program = self._program
+        r = self._registers
+        ip = self._ip
+        while 0 <= ip < len(program):
+            instruction = program[ip]
+            operation = instruction[0]
+
+            if operation >= ADD:
+                if operation == ADD:
+                    _, target, counter = instruction
+                    if r[counter] > 0:
+                        r[target] += r[counter]
+                        r[counter] = 0
+                        ip += 3
+                        continue
+                elif operation == MUL:
+                    _, sr, s, target, inner, counter = instruction
+                    value = r[s] if sr else s
+                    if value > 0 and r[counter] > 0:
+                        r[target] += value * r[counter]
+                        r[inner] = 0
+                        r[counter] = 0
+                        ip += 6
+                        continue
+                else:
+                    _, divisor, dividend, remainder, quotient = instruction
+                    if r[dividend] >= 0:
+                        r[quotient] += r[dividend] // divisor
+                        r[remainder] = divisor - r[dividend] % divisor
+                        r[dividend] = 0
+                        ip += 8
+                        continue
+                if self._verbose:
+                    print(f"a:{r[0]} b:{r[1]} c:{r[2]} d:{r[3]} @ [{ip}] fused {instruction} not applicable")
+                instruction = source[ip]
+                operation = instruction[0]
+
+            if self._verbose:
+                print(f"a:{r[0]} b:{r[1]} c:{r[2]} d:{r[3]} @ [{ip}] {instruction}")
+
+            _, xr, x, yr, y = instruction
+            if operation == JNZ:
+                if (r[x] if xr else x) != 0:
+                    ip += r[y] if yr else y
+                else:
+                    ip += 1
+            elif operation == INC:
+                if xr:
+                    r[x] += 1
+                ip += 1
+            elif operation == DEC:
+                if xr:
+                    r[x] -= 1
+                ip += 1
+            elif operation == CPY:
+                # toggled instructions can end up copying into a constant, which is skipped
+                if yr:
+                    r[y] = r[x] if xr else x
+                ip += 1
+            elif operation == TGL:
+                target = ip + (r[x] if xr else x)
+                if 0 <= target < len(source):
+                    source[target] = toggle(source[target])
+                    program = self._program = optimize(source)
+                ip += 1
+            else:
+                self._ip = ip
+                if on_output is not None and not on_output(r[x] if xr else x):
+                    self._ip = ip + 1
+                    return
+                ip += 1
+        self._ip = ip
@@ -1,6 +1,5 @@
 from adventofcode.common import Solution
-
-import hashlib
+from adventofcode.common.hashing import NonceMiner
 
 
 class Day05(Solution):
@@ -9,22 +8,23 @@ class Day05(Solution):
 
         self._input = self._load_input_as_string()
 
+    def _hits(self, workers: int = 1):
+        # mined in process unless workers asks for a pool
+        return NonceMiner(self._input, 5, workers=workers).hits()
+
     def part_one(self):
         # O(n) time complexity (n is search space of md5 hash with 5 leading zeroes)
         # O(c) space complexity
         password = ['?', '?', '?', '?', '?', '?', '?', '?']
         found = 0
-        i = 0
+        hits = self._hits()
         while found < 8:
-            attempt = '{id}{i}'.format(id=self._input, i=i)
-            s = hashlib.md5(attempt.encode()).hexdigest()
-
-            if s[:5] == '00000':
-                print('{s} found at index {i}'.format(s=s, i=i))
-                password[found] = s[5]
-                found += 1
-
-            i += 1
+            i, digest = next(hits)
+            print('{s} found at index {i}'.format(s=digest.hex(), i=i))
+            # 6th hex digit is the low nibble of the 3rd byte
+            password[found] = '{c:x}'.format(c=digest[2] & 0x0f)
+            found += 1
+        hits.close()
 
         return ''.join(password)
 
@@ -33,16 +33,15 @@ class Day05(Solution):
         # O(c) space complexity
         password = ['?', '?', '?', '?', '?', '?', '?', '?']
         found = 0
-        i = 0
+        hits = self._hits()
         while found < 8:
-            attempt = '{id}{i}'.format(id=self._input, i=i)
-            s = hashlib.md5(attempt.encode()).hexdigest()
-
-            if s[:5] == '00000' and s[5] in ('0', '1', '2', '3', '4', '5', '6', '7') and password[int(s[5])] == '?':
-                print('{s} found at index {i}'.format(s=s, i=i))
-                password[int(s[5])] = s[6]
+            i, digest = next(hits)
+            position = digest[2] & 0x0f
+            if position < 8 and password[position] == '?':
+                print('{s} found at index {i}'.format(s=digest.hex(), i=i))
+                # 7th hex digit is the high nibble of the 4th byte
+                password[position] = '{c:x}'.format(c=digest[3] >> 4)
                 found += 1
-
-            i += 1
+        hits.close()
 
         return ''.join(password)
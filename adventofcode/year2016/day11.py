@@ -1,6 +1,6 @@
 from __future__ import annotations
 from adventofcode.common import Solution
-from adventofcode.common.graph.search import AStar, SearchState, S
+from adventofcode.common.graph.search import AStar, SearchState, S, pack_fingerprint
 from copy import copy
 from functools import reduce
 from itertools import combinations
@@ -113,8 +113,9 @@ class StepSearchState(SearchState):
         # number of chips and generators remaining on first, second, and third floor with floors further away from 4th counting less
         return (self._floors[0].chips_count + self._floors[0].rtgs_count) + (self._floors[1].chips_count + self._floors[1].rtgs_count) + (self._floors[2].chips_count + self._floors[2].rtgs_count)
 
-    def _hash(self) -> str:
-        return str(self._current_floor) + ":" + ":".join(["{chip:05b}-{rtg:05b}".format(chip=floor.chips_hash, rtg=floor.rtgs_hash) for floor in self._floors])
+    def _hash(self) -> int:
+        # current floor followed by each floor's chip and rtg bitmaps, one isotope-count wide field each
+        return pack_fingerprint([self._current_floor] + [h for floor in self._floors for h in (floor.chips_hash, floor.rtgs_hash)], max(2, len(self._isotopes.ids)))
 
     def next_search_states(self) -> List[S]:
         next_states = []
@@ -1,14 +1,16 @@
 from __future__ import annotations
 from adventofcode.common import Solution
-from collections import deque
+from adventofcode.common.hashing import HashStream
 from dataclasses import dataclass
-from functools import reduce
-from typing import Deque, Dict
+from typing import Optional, Tuple
 
-import hashlib
 import re
 
 
+repeat3_regex = re.compile(r'([a-z0-9])\1{2}')
+repeat5_regex = re.compile(r'([a-z0-9])\1{4}')
+
+
 @dataclass
 class OTPKey:
     index: int
@@ -16,78 +18,43 @@ class OTPKey:
     character: str
 
 
+def summarize_hash(md5hash: str) -> Tuple[str, Optional[str], int]:
+    # (hash, character of its first 3-repeat or None, bitmask of the hex digits that appear as a 5-repeat)
+    triple = repeat3_regex.search(md5hash)
+    quintuples = 0
+    for match in repeat5_regex.finditer(md5hash):
+        quintuples |= 1 << int(match.group(1), 16)
+    return md5hash, triple.group(1) if triple else None, quintuples
+
+
 class OTP(object):
     def __init__(self, salt: str):
         self._salt = salt
-        self._hash_cache: Dict[int, str] = {}
-        self._candidates: Deque[OTPKey] = deque([])
-        self._confirms: Dict[int, OTPKey] = {}
-        self._repeat3_regex = re.compile(r'([a-z0-9])\1{2}')
-        self._repeat5_regex = re.compile(r'([a-z0-9])\1{4}')
         self._hash_stretch = False
 
-    def _hash(self, i: int) -> str:
-        if i not in self._hash_cache:
-            if self._hash_stretch:
-                self._hash_cache[i] = reduce(lambda acc, h: hashlib.md5(str(acc).encode('utf-8')).hexdigest(), range(0, 2016), hashlib.md5((self._salt + str(i)).encode('utf-8')).hexdigest())
-            else:
-                self._hash_cache[i] = hashlib.md5((self._salt + str(i)).encode('utf-8')).hexdigest()
-
-        return self._hash_cache[i]
-
     def hash_stretch(self, toggle: bool) -> OTP:
         self._hash_stretch = toggle
         return self
 
-    def generate(self, amount: int) -> OTPKey:
+    def generate(self, amount: int, workers: int = 1) -> OTPKey:
         keys = []
-
-        i = 0
-        while len(keys) < amount:
-            # get next candidate
-            try:
-                candidate_key = self._candidates.popleft()
-                i = candidate_key.index + 1
-            except:
-                # candidates queue is empty, so generate next hash until first 3-repeat is encountered
-                candidate_key = None
-                while candidate_key is None:
-                    md5hash = self._hash(i)
-                    candidate_match = self._repeat3_regex.search(md5hash)
-
-                    if candidate_match:
-                        candidate_key = OTPKey(i, md5hash, candidate_match.groups()[0])
-                    i += 1
-
-            max_j = i + 1000
-            j = i
-            # candidate retrieved....look for next 1000 to see if there is a 5-repeat
-            for (confirm_index, confirm_key) in ((k, v) for (k, v) in self._confirms.items() if i <= k < max_j):
-                j = confirm_index
-                # check to see if any of the memoized confirms match
-                if confirm_key.character == candidate_key.character:
-                    keys.append(candidate_key)
-                    print(f"({len(keys)}/{amount}) : key at {candidate_key.index} [{candidate_key.key}] with confirmation at {confirm_key.index} [{confirm_key.key}] ({confirm_key.index - candidate_key.index} away)")
-                    break
-            else:
-                # memoized confirms do not contain any match, keep searching until reached max 1000
-                while j < max_j:
-                    md5hash = self._hash(j)
-
-                    candidate_match = self._repeat3_regex.search(md5hash)
-                    if candidate_match and self._candidates.count(OTPKey(j, md5hash, candidate_match.groups()[0])) == 0:
-                        self._candidates.append(OTPKey(j, md5hash, candidate_match.groups()[0]))
-
-                    confirm_match = self._repeat5_regex.search(md5hash)
-                    if confirm_match:
-                        if confirm_match.groups()[0] == candidate_key.character:
-                            keys.append(candidate_key)
-                            print(f"({len(keys)}/{amount}) : key at {candidate_key.index} [{candidate_key.key}] with confirmation at {j} [{md5hash}] ({j - candidate_key.index} away)")
+        # hashes are produced in batches ahead of the candidate (across a pool if workers asks for one) and dropped once
+        # the candidate has moved past them
+        with HashStream(self._salt, 2016 if self._hash_stretch else 0, summarize_hash, workers=workers) as hashes:
+            i = 0
+            while len(keys) < amount:
+                md5hash, character, _ = hashes[i]
+                if character is not None:
+                    # candidate....look at the next 1000 hashes for a 5-repeat of the same character
+                    bit = 1 << int(character, 16)
+                    for j in range(i + 1, i + 1001):
+                        confirm_hash, _, quintuples = hashes[j]
+                        if quintuples & bit:
+                            keys.append(OTPKey(i, md5hash, character))
+                            print(f"({len(keys)}/{amount}) : key at {i} [{md5hash}] with confirmation at {j} [{confirm_hash}] ({j - i} away)")
                             break
-                        elif j not in self._confirms:
-                            # a match, but does not match candidate key character...save it for future use
-                            self._confirms[j] = OTPKey(j, md5hash, confirm_match.groups()[0])
-                    j += 1
+                i += 1
+                hashes.evict(i)
 
         return keys[-1]
 
@@ -1,19 +1,35 @@
 from __future__ import annotations
 from adventofcode.common import Solution
+from itertools import accumulate
 
 
-def dragon_curve(data: str, length: int) -> str:
-    while len(data) < length:
-        data = data + '0' + ''.join(('1' if c == '0' else '0' for c in reversed(data)))
-    return data[:length]
+def joiner_ones(n: int) -> int:
+    # ones among the first n joining bits of a dragon curve. joining bit i is the regular paperfolding sequence, 1 when the
+    # odd part of i is 3 mod 4, so count those odd parts for every power of two
+    ones = 0
+    while n > 0:
+        ones += (n + 1) // 4
+        n >>= 1
+    return ones
 
 
-def checksum(data: str) -> str:
-    while True:
-        data = ''.join(('1' if a == b else '0' for (a, b) in zip(*[iter(data)] * 2)))
-        if len(data) % 2 == 1:
-            break
-    return data
+def dragon_checksum(data: str, length: int) -> str:
+    # the filled disk is the input a and its reversed complement b alternating, a 0 b ? a ? b ..., with the joining bits in
+    # between, so the number of ones in any prefix has a closed form. every checksum digit covers the same power of two
+    # sized chunk and comes down to whether that chunk holds an even number of ones, so nothing is ever materialised
+    if length % 2 == 1:
+        raise Exception(f"Cannot checksum an odd length of {length}")
+    period = len(data) + 1
+    prefix_a = [0] + list(accumulate(1 if c == '1' else 0 for c in data))
+    prefix_b = [0] + list(accumulate(1 if c == '0' else 0 for c in reversed(data)))
+
+    def ones(n: int) -> int:
+        blocks, partial = divmod(n, period)
+        full = (blocks + 1) // 2 * prefix_a[-1] + blocks // 2 * prefix_b[-1] + joiner_ones(blocks)
+        return full + (prefix_a if blocks % 2 == 0 else prefix_b)[partial]
+
+    chunk = length & -length
+    return ''.join('1' if (ones(i + chunk) - ones(i)) % 2 == 0 else '0' for i in range(0, length, chunk))
 
 
 class Day16(Solution):
@@ -22,8 +38,7 @@ class Day16(Solution):
         self._input = self._load_input_as_string()
 
     def part_one(self):
-        return checksum(dragon_curve(self._input, 272))
+        return dragon_checksum(self._input, 272)
 
     def part_two(self):
-        return checksum(dragon_curve(self._input, 35651584))
-    
\ No newline at end of file
+        return dragon_checksum(self._input, 35651584)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from adventofcode.common import Solution
-from adventofcode.common.graph.search import AStar, BFS, SearchPath, SearchState, S
+from adventofcode.common.graph.search import AStar, BFS, SearchPath, SearchState, S, pack_fingerprint
 from adventofcode.common.grid import Point2D
 from typing import List
 
@@ -18,7 +18,7 @@ class ShortestSearchState(SearchState):
         self._position = position
         self._sequence = sequence
         self._door_hash = hashlib.md5(self._sequence.encode('utf-8')).hexdigest()[:len(directions)]
-        super().__init__(f"{self._position}" if self._position.x == maxX and self._position.y == maxY else f"{self._position}:{''.join(self._door_hash)}", gain, cost)
+        super().__init__(pack_fingerprint((self._position.x, self._position.y, 0 if self._position.x == maxX and self._position.y == maxY else int(self._door_hash, 16)), 16), gain, cost)
 
     @property
     def sequence(self):
@@ -79,7 +79,7 @@ class Day17(Solution):
         end = Point2D(4, 4)
         start_state = ShortestSearchState(start, self._input, 0, 0)
         end_state = ShortestSearchState(end, '', 0, 0)
-        end_state.fingerprint = f"{end}"
+        end_state.fingerprint = pack_fingerprint((end.x, end.y, 0), 16)
         astar = AStar(start_state, end_state)
 
         astar.verbose(True, 1000)
@@ -1,42 +1,47 @@
 from __future__ import annotations
 from adventofcode.common import Solution
-from adventofcode.common.util import show_grid
-from itertools import tee
-from typing import Iterable, List
+from typing import Iterator
 
 
-def triplets(iterable: Iterable):
-    a, b, c = tee(iterable, 3)
-    next(b, None)
-    next(c, None)
-    next(c, None)
-    return zip(a, b, c)
+def next_row(row: int, mask: int) -> int:
+    # a tile is a trap exactly when the tiles to its left and right differ
+    return ((row << 1) ^ (row >> 1)) & mask
 
 
 class Room(object):
     def __init__(self, initial_tiles: str):
-        self._tiles = [[c for c in initial_tiles]]
-        self._safe_tiles = sum((1 for c in self._tiles[0] if c == '.'))
+        # a row is a bitset with traps as set bits and the leftmost tile as the highest bit. a tile is a trap exactly when
+        # the tiles to its left and right differ, so the next row is the row shifted both ways and xored, with the walls
+        # beyond either end dropping off the shift. only the latest row is ever kept
+        self._initial = initial_tiles
+        self._width = len(initial_tiles)
+        self._mask = (1 << self._width) - 1
+        self._row = int(initial_tiles.replace('.', '0').replace('^', '1'), 2)
+        self._safe_tiles = self._width - self._row.bit_count()
 
     @property
     def safe_tiles(self) -> int:
         return self._safe_tiles
 
-    @property
-    def tiles(self) -> List[List[str]]:
-        return self._tiles
-
     def advance(self, rows: int):
-        for i in range(rows):
-            rows = []
-            for (left, center, right) in triplets(['.'] + self._tiles[-1] + ['.']):
-                match [left, center, right]:
-                    case ['^', '^', '.'] | ['.', '^', '^'] | ['^', '.', '.'] | ['.', '.', '^']:
-                        rows.append('^')
-                    case _:
-                        rows.append('.')
-                        self._safe_tiles += 1
-            self._tiles.append(rows)
+        row, mask, width = self._row, self._mask, self._width
+        safe_tiles = 0
+        for _ in range(rows):
+            row = next_row(row, mask)
+            safe_tiles += width - row.bit_count()
+        self._row = row
+        self._safe_tiles += safe_tiles
+
+    def rows(self) -> Iterator[str]:
+        # every row from the first one onwards, generated as it is read
+        row = int(self._initial.replace('.', '0').replace('^', '1'), 2)
+        while True:
+            yield format(row, f"0{self._width}b").replace('0', '.').replace('1', '^')
+            row = next_row(row, self._mask)
+
+    def show(self, rows: int) -> None:
+        for _, row in zip(range(rows), self.rows()):
+            print(row)
 
 
 class Day18(Solution):
@@ -48,7 +53,7 @@ class Day18(Solution):
         r = Room(self._input)
         r.advance(39)
 
-        show_grid(r.tiles)
+        r.show(40)
 
         return r.safe_tiles
 
@@ -56,6 +61,4 @@ class Day18(Solution):
         r = Room(self._input)
         r.advance(399999)
 
-        show_grid(r.tiles)
-
         return r.safe_tiles
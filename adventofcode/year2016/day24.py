@@ -1,7 +1,6 @@
 from __future__ import annotations
 from adventofcode.common import Solution
-from adventofcode.common.graph.search import AStar, BFS, SearchPath, SearchState, S
-from itertools import combinations
+from adventofcode.common.graph.search import BFS, SearchPath, SearchState, S, distance_table
 from typing import Dict, List
 
 
@@ -35,6 +34,10 @@ class LocationSearchState(SearchState):
         self._x = x
         self._y = y
 
+    @property
+    def location(self) -> str:
+        return self._maze.position(self._x, self._y)
+
     def next_search_states(self) -> List[S]:
         states = []
 
@@ -112,20 +115,15 @@ class Day24(Solution):
         super().__init__(year, day)
         self._maze = DuctMaze(self._load_input_as_lines())
 
-        # build lookup of the shortest paths between all locations
+        # build lookup of the shortest paths between all locations with one sweep from each location
+        table = distance_table(
+            {location: LocationSearchState(self._maze, x, y, 0, 0) for location, (x, y) in self._maze.locations.items()},
+            {location: (lambda state, location=location: state.location == location) for location in self._maze.locations.keys()}
+        )
         self._shortest_lookup = {}
-        for (start, end) in combinations(sorted(self._maze.locations.keys()), 2):
-            astar = AStar(
-                LocationSearchState(self._maze, self._maze.locations[start][0], self._maze.locations[start][1], 0, 0),
-                LocationSearchState(self._maze, self._maze.locations[end][0], self._maze.locations[end][1], 0, 0)
-            )
-            shortest = astar.find_path().cost
-
-            print(f"shortest from location {start} to location {end} : {shortest}")
-
-            # the shortest path between two locations should be the same in both directions
-            self._shortest_lookup[f"{start}-{end}"] = shortest
-            self._shortest_lookup[f"{end}-{start}"] = shortest
+        for (start, end), state in sorted(table.items()):
+            print(f"shortest from location {start} to location {end} : {state.cost}")
+            self._shortest_lookup[f"{start}-{end}"] = state.cost
 
     def part_one(self):
         start_state = EveryLocationSearchState(self._maze, self._shortest_lookup, [location for location in self._maze.locations.keys() if location != '0'], '0', 0, 0)
@@ -1,62 +1,55 @@
 from __future__ import annotations
 from adventofcode.common import Solution
-from adventofcode.year2019.day05 import IntCodeCPUModified
+from adventofcode.year2019.intcode import IntCodeScheduler, run_parallel
+from functools import partial
 from itertools import permutations
-from typing import List
+from typing import List, Tuple
 
 
 class AmplifierSystem(object):
     def __init__(self, instructions: List[int], amplifiers: int):
-        self._amplifiers = [IntCodeCPUModified(instructions) for i in range(amplifiers)]
+        self._scheduler = IntCodeScheduler(instructions)
+        self._amplifiers = [self._scheduler.spawn() for i in range(amplifiers)]
+        self._thruster_input = 0
 
     def set_phase(self, index: int, phase: int):
-        self._amplifiers[index].add_input(phase)
+        self._scheduler.send(self._amplifiers[index], phase)
+
+    def _forward(self, amplifier: int, value: int) -> None:
+        # each amplifier feeds the next and the last one feeds both the thrusters and (in feedback mode) the first
+        if amplifier == self._amplifiers[-1]:
+            self._thruster_input = value
+        self._scheduler.send(self._amplifiers[(amplifier + 1) % len(self._amplifiers)], value)
 
     def run(self) -> int:
-        thruster_input = 0
-        amplifier_input = 0
-        finished = False
-        while not finished:
-            for i, amplifier in enumerate(self._amplifiers):
-                amplifier.add_input(amplifier_input)
-                amplifier.run()
-                amplifier_input = amplifier.get_output()
+        self._scheduler.send(self._amplifiers[0], 0)
+        self._scheduler.run(self._forward)
+        return self._thruster_input
 
-            thruster_input = amplifier_input
-            finished = self._amplifiers[-1].halted
 
-        return thruster_input
+def measure_thrust(instructions: List[int], phases: Tuple[int, ...]) -> int:
+    ampsys = AmplifierSystem(instructions, len(phases))
+    for i, phase in enumerate(phases):
+        ampsys.set_phase(i, phase)
+    return ampsys.run()
 
 
 class Day07(Solution):
     def __init__(self, year: str, day: str):
         super().__init__(year, day)
-        self._input = [int(i) for i in self._load_input_as_string().split(',')]
-
-    def part_one(self):
-        best = 0
-        for permutation in permutations(range(5), 5):
-            ampsys = AmplifierSystem(self._input, 5)
-            for i, phase in enumerate(permutation):
-                ampsys.set_phase(i, phase)
-            output = ampsys.run()
+        self._input = self._load_input_as_ints()
 
-            print(f"phase configuration : {permutation} --> {output}")
-            if output > best:
-                best = output
+    def _best_thrust(self, phases: range, workers: int = 1) -> int:
+        configurations = list(permutations(phases, len(phases)))
+        # every phase configuration is independent, but each chain only takes microseconds so they run in process unless
+        # workers asks for a pool
+        outputs = run_parallel(partial(measure_thrust, self._input), configurations, workers)
+        for configuration, output in zip(configurations, outputs):
+            print(f"phase configuration : {configuration} --> {output}")
+        return max(outputs)
 
-        return best
+    def part_one(self):
+        return self._best_thrust(range(5))
 
     def part_two(self):
-        best = 0
-        for permutation in permutations(range(5, 10), 5):
-            ampsys = AmplifierSystem(self._input, 5)
-            for i, phase in enumerate(permutation):
-                ampsys.set_phase(i, phase)
-            output = ampsys.run()
-
-            print(f"phase configuration : {permutation} --> {output}")
-            if output > best:
-                best = output
-
-        return best
\ No newline at end of file
+        return self._best_thrust(range(5, 10))
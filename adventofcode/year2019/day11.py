@@ -1,7 +1,7 @@
 from __future__ import annotations
 from adventofcode.common import Solution
 from adventofcode.common.grid import Point2D
-from adventofcode.year2019.day09 import IntCodeCPUComplete
+from adventofcode.year2019.intcode import IntCodeCPU
 from typing import List
 
 import sys
@@ -9,7 +9,7 @@ import sys
 
 class HullPaintingRobot(object):
     def __init__(self, program: List[int], initial_input: int):
-        self._cpu = IntCodeCPUComplete(program)
+        self._cpu = IntCodeCPU(program)
         self._cpu.add_input(initial_input)
         self._position = Point2D(0, 0)
         self._panels = {}
@@ -64,7 +64,7 @@ class HullPaintingRobot(object):
 class Day11(Solution):
     def __init__(self, year: str, day: str):
         super().__init__(year, day)
-        self._input = [int(i) for i in self._load_input_as_string().split(',')]
+        self._input = self._load_input_as_ints()
 
     def part_one(self):
         hpb = HullPaintingRobot(self._input, 0)
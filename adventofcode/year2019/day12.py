@@ -1,12 +1,22 @@
 from __future__ import annotations
 from adventofcode.common import Solution
+from adventofcode.common.cycle import CycleDetector
 from adventofcode.common.grid import Point3D
 from itertools import combinations
-from typing import List
+from typing import List, Tuple
 
 import math
 
 
+def step_axis(state: Tuple[int, ...]) -> Tuple[int, ...]:
+    # one step along a single axis for a state of every moon's position followed by every moon's velocity. the axes never
+    # interact, so each one can be simulated on its own
+    n = len(state) // 2
+    positions = state[:n]
+    velocities = [v + sum((q > p) - (q < p) for q in positions) for p, v in zip(positions, state[n:])]
+    return tuple(p + v for p, v in zip(positions, velocities)) + tuple(velocities)
+
+
 class Moon(object):
     def __init__(self, position: Point3D):
         self._position = position
@@ -84,22 +94,12 @@ class Day12(Solution):
         return sum((m.kinetic_energy() * m.potential_energy() for m in nbs.moons))
 
     def part_two(self):
-        nbs = NBodySystem(self._moons)
-        properties = ('x', 'y', 'z')
-        repeats = [False, False, False]
-        periods = [0, 0, 0]
-        states = [[(getattr(m.position, properties[0]), getattr(m.velocity, properties[0])) for m in nbs.moons],
-                  [(getattr(m.position, properties[1]), getattr(m.velocity, properties[1])) for m in nbs.moons],
-                  [(getattr(m.position, properties[2]), getattr(m.velocity, properties[2])) for m in nbs.moons]]
-
-        while not repeats[0] or not repeats[1] or not repeats[2]:
-            nbs.step()
-            for i in range(3):
-                if not repeats[i]:
-                    state = [(getattr(m.position, properties[i]), getattr(m.velocity, properties[i])) for m in nbs.moons]
-                    if state == states[i]:
-                        periods[i] = nbs.steps
-                        repeats[i] = True
+        # the simulation is reversible so every axis state is on its own cycle and comes back around to the start
+        detector = CycleDetector(step_axis)
+        periods = []
+        for p in ('x', 'y', 'z'):
+            state = tuple(getattr(m.position, p) for m in self._moons) + tuple(getattr(m.velocity, p) for m in self._moons)
+            periods.append(detector.period(state))
 
         print(f"x period = {periods[0]}, y period = {periods[1]}, z period = {periods[2]}")
 
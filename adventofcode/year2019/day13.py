@@ -1,7 +1,7 @@
 from __future__ import annotations
 from adventofcode.common import Solution
 from adventofcode.common.grid import Point2D
-from adventofcode.year2019.day09 import IntCodeCPUComplete
+from adventofcode.year2019.intcode import IntCodeCPU
 from functools import reduce
 from typing import List
 
@@ -12,7 +12,7 @@ class ArcadeCabinet(object):
     _tile_map = (' ', '#', '=', '-', '@')
 
     def __init__(self, program: List[int], free: bool = False, verbose: bool = False):
-        self._cpu = IntCodeCPUComplete(program, verbose)
+        self._cpu = IntCodeCPU(program, verbose)
         self._screen = {}
         self._score = 0
 
@@ -94,7 +94,7 @@ class ArcadeCabinet(object):
 class Day13(Solution):
     def __init__(self, year: str, day: str):
         super().__init__(year, day)
-        self._input = [int(i) for i in self._load_input_as_string().split(',')]
+        self._input = self._load_input_as_ints()
 
     def part_one(self):
         ac = ArcadeCabinet(self._input, False, False)
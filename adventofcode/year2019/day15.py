@@ -2,7 +2,7 @@ from __future__ import annotations
 from adventofcode.common import Solution
 from adventofcode.common.graph.search import AStar, S, SearchState
 from adventofcode.common.grid import Point2D
-from adventofcode.year2019.day09 import IntCodeCPUComplete
+from adventofcode.year2019.intcode import IntCodeCPU
 from collections import deque
 from functools import reduce
 from typing import Dict, List
@@ -32,7 +32,7 @@ class OxygenSearchState(SearchState):
 
 class RepairBot(object):
     def __init__(self, program: List[int], verbose: bool = False):
-        self._cpu = IntCodeCPUComplete(program, verbose)
+        self._cpu = IntCodeCPU(program, verbose)
         self._position = Point2D(0, 0)
         self._oxygen = Point2D(0, 0)
         self._map: Dict[Point2D, str] = {self._position: '.'}
@@ -46,49 +46,32 @@ class RepairBot(object):
         return self._map
 
     def crawl(self) -> None:
-        path = deque([(0, self._position)])
-        while len(path) > 0:
-            direction_code, self._position = path.pop()
-
-            candidates = [(direction[0], self._position + direction[1]) for direction in directions if (self._position + direction[1]) not in self._map.keys()]
-            if len(candidates) > 0:
-                # current position has at least 1 direction that has not been explored yet
-                path.append((direction_code, self._position))
-
-                # attempt move to first unexplored position in list of candidates
-                self._cpu.add_input(candidates[0][0])
-                self._cpu.run()
-                match self._cpu.get_output():
+        # breadth first over the maze. every open position keeps a fork of the droid standing on it, so no move ever has to be undone
+        frontier = deque([(self._position, self._cpu)])
+        while len(frontier) > 0:
+            position, cpu = frontier.popleft()
+            for direction_code, delta in directions:
+                candidate = position + delta
+                if candidate in self._map:
+                    continue
+
+                droid = cpu.fork()
+                droid.add_input(direction_code)
+                droid.run()
+                match droid.get_output():
                     case 0:
-                        # hit a wall...mark map and backtrack to last position that has unexplored areas
-                        self._map[candidates[0][1]] = '#'
-                    case 1 | 2:
-                        # successfully moved towards the direction...add new position to path
-                        path.append((candidates[0][0], candidates[0][1]))
-                        if self._cpu.get_output() == 2:
-                            # found oxygen system
-                            self._map[candidates[0][1]] = 'X'
-                            self._oxygen = candidates[0][1]
-                        else:
-                            self._map[candidates[0][1]] = '.'
-                    case _:
-                        raise Exception(f"Invalid response from repair bot : {self._cpu.get_output()}")
-            else:
-                # current position has no unexplored directions...backtrack to previous position
-                match direction_code:
-                    case 0:
-                        continue
+                        # hit a wall...droid stays where it was
+                        self._map[candidate] = '#'
                     case 1:
-                        self._cpu.add_input(2)
+                        self._map[candidate] = '.'
+                        frontier.append((candidate, droid))
                     case 2:
-                        self._cpu.add_input(1)
-                    case 3:
-                        self._cpu.add_input(4)
-                    case 4:
-                        self._cpu.add_input(3)
-                self._cpu.run()
-                if self._cpu.get_output() != 1:
-                    raise Exception(f"Unexpected response from repair bot while backtracking from {self._position} with direction code {direction_code}")
+                        # found oxygen system
+                        self._map[candidate] = 'X'
+                        self._oxygen = candidate
+                        frontier.append((candidate, droid))
+                    case response:
+                        raise Exception(f"Invalid response from repair bot : {response}")
 
     def show(self) -> None:
         minx = reduce(lambda acc, p: acc if acc < p.x else p.x, self._map.keys(), sys.maxsize)
@@ -111,7 +94,7 @@ class RepairBot(object):
 class Day15(Solution):
     def __init__(self, year: str, day: str):
         super().__init__(year, day)
-        self._robot = RepairBot([int(i) for i in self._load_input_as_string().split(',')])
+        self._robot = RepairBot(self._load_input_as_ints())
 
     def part_one(self):
         self._robot.crawl()
@@ -1,7 +1,7 @@
 from __future__ import annotations
 from adventofcode.common import Solution
 from adventofcode.common.grid import Point2D
-from adventofcode.year2019.day09 import IntCodeCPUComplete
+from adventofcode.year2019.intcode import IntCodeCPU
 from typing import Iterable, List, Set, Tuple
 
 import math
@@ -65,7 +65,7 @@ class MovementSplitter(object):
 
 class VacuumBot(object):
     def __init__(self, program: List[int], verbose: bool = False):
-        self._cpu = IntCodeCPUComplete(program, verbose)
+        self._cpu = IntCodeCPU(program, verbose)
         self._scaffolds: Set[Point2D] = set([])
         self._screen: List[int] = []
         self._orientation_index = 0
@@ -172,7 +172,7 @@ class VacuumBot(object):
 class Day17(Solution):
     def __init__(self, year: str, day: str):
         super().__init__(year, day)
-        self._input = [int(i) for i in self._load_input_as_string().split(',')]
+        self._input = self._load_input_as_ints()
 
     def part_one(self):
         robot = VacuumBot(self._input)
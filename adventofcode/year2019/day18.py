@@ -1,9 +1,8 @@
 from __future__ import annotations
 from adventofcode.common import Solution
-from adventofcode.common.graph.search import AStar, BFS, DFS, S, SearchState, SearchPath
+from adventofcode.common.graph.search import DFS, S, SearchState, SearchPath, distance_table
 from adventofcode.common.grid import Point2D
 from functools import reduce
-from itertools import combinations
 from typing import Dict, List, Set, Tuple
 
 import sys
@@ -44,6 +43,10 @@ class ShortestKeySearchState(SearchState):
         self._position = position
         self._locks = locks
 
+    @property
+    def position(self) -> Point2D:
+        return self._position
+
     @property
     def locks(self) -> List[str]:
         return self._locks
@@ -217,28 +220,14 @@ class Day18(Solution):
                 self._input[p] = c
 
     def _find_shortest_path(self, maze: NeptuneMaze) -> Dict[str, Tuple[int, List[str]]]:
-        shortest_paths = {}
-
-        # find shortest path from start position to each key and store the steps between them and locks encountered
-        for k in maze.keys.values():
-            astar = AStar(
-                ShortestKeySearchState(maze, maze.position, [], 0, 0),
-                ShortestKeySearchState(maze, maze.key_positions[k], [], 0, 0)
-            )
-            path = astar.find_path()
-            shortest_paths[f"@{k}"] = (path.cost, path.last.locks)
-
-        # find shortest path from every pair of keys and store the steps between them and locks encountered
-        for a, b in combinations(maze.keys.values(), 2):
-            astar = AStar(
-                ShortestKeySearchState(maze, maze.key_positions[a], [], 0, 0),
-                ShortestKeySearchState(maze, maze.key_positions[b], [], 0, 0)
-            )
-            path = astar.find_path()
-            shortest_paths[f"{a}{b}"] = (path.cost, path.last.locks)
-            shortest_paths[f"{b}{a}"] = (path.cost, path.last.locks)
-
-        return shortest_paths
+        # find shortest path from start position and every key to each key and store the steps between them and locks encountered
+        starts = {k: ShortestKeySearchState(maze, p, [], 0, 0) for k, p in maze.key_positions.items()}
+        starts['@'] = ShortestKeySearchState(maze, maze.position, [], 0, 0)
+        table = distance_table(
+            starts,
+            {k: (lambda state, p=p: state.position == p) for k, p in maze.key_positions.items()}
+        )
+        return {f"{a}{b}": (state.cost, state.locks) for (a, b), state in table.items()}
 
 
     def part_one(self):
@@ -2,7 +2,7 @@ from __future__ import annotations
 from adventofcode.common import Solution
 from adventofcode.common.grid import Point2D
 from adventofcode.common.range import Box2D
-from adventofcode.year2019.day09 import IntCodeCPUComplete
+from adventofcode.year2019.intcode import IntCodeCPU
 from functools import reduce
 from typing import Dict, List
 
@@ -14,10 +14,12 @@ deltas = (Point2D(-1, -1), Point2D(-1, 0), Point2D(0, -1))
 
 class TractorBeamSystem(object):
     def __init__(self, program: List[int]):
-        self._program = program
+        # run the drone up to its first input request once, every probe forks from there
+        self._drone = IntCodeCPU(program)
+        self._drone.run()
 
     def measure_position(self, position: Point2D) -> int:
-        drone = IntCodeCPUComplete(self._program)
+        drone = self._drone.fork()
         drone.add_input(position.x)
         drone.add_input(position.y)
         drone.run()
@@ -62,7 +64,7 @@ class TractorBeamSystem(object):
 class Day19(Solution):
     def __init__(self, year: str, day: str):
         super().__init__(year, day)
-        self._input = [int(i) for i in self._load_input_as_string().split(',')]
+        self._input = self._load_input_as_ints()
 
     def part_one(self):
         tbs = TractorBeamSystem(self._input)
@@ -1,18 +1,28 @@
 from __future__ import annotations
 from adventofcode.common import Solution
-from adventofcode.year2019.day09 import IntCodeCPUComplete
+from adventofcode.year2019.intcode import IntCodeCPU
 from typing import List
 
 
 class SpringBot(object):
     def __init__(self, program: List[int]):
-        self._cpu = IntCodeCPUComplete(program)
+        self._cpu = IntCodeCPU(program)
         self._output = []
 
+        # warm up to the instruction prompt so every script can be tried from the same state
+        self._prompt = []
+        while not self._cpu.need_input and not self._cpu.halted:
+            self._cpu.run()
+            if self._cpu.has_output:
+                self._prompt.append(self._cpu.get_output())
+        self._ready = self._cpu.snapshot()
+
     def _compile(self, spring_script: List[str]) -> List[int]:
         return [ord(c) for c in "".join([f"{line}\n" for line in spring_script])]
 
     def run(self, spring_script: List[str]) -> int:
+        self._cpu.restore(self._ready)
+        self._output = list(self._prompt)
         for c in self._compile(spring_script):
             self._cpu.add_input(c)
 
@@ -38,10 +48,10 @@ class SpringBot(object):
 class Day21(Solution):
     def __init__(self, year: str, day: str):
         super().__init__(year, day)
-        self._input = [int(i) for i in self._load_input_as_string().split(',')]
+        self._springbot = SpringBot(self._load_input_as_ints())
 
     def part_one(self):
-        sb = SpringBot(self._input)
+        sb = self._springbot
         response = sb.run([
             # jump if next step is hole
             "NOT A J",
@@ -56,7 +66,7 @@ class Day21(Solution):
         return response
 
     def part_two(self):
-        sb = SpringBot(self._input)
+        sb = self._springbot
         response = sb.run([
             # jump if next step is hole
             "NOT A J",
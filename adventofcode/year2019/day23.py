@@ -1,9 +1,7 @@
 from __future__ import annotations
 from adventofcode.common import Solution
-from adventofcode.year2019.day09 import IntCodeCPUComplete
-from collections import deque
-from functools import reduce
-from typing import Deque, List, Optional
+from adventofcode.year2019.intcode import IntCodeScheduler
+from typing import List, Optional
 
 
 class NetworkException(Exception):
@@ -30,63 +28,39 @@ class NetworkPacket(object):
 
 
 class NetworkComputer(object):
-    def __init__(self, address: int, program: List[int], switch: NetworkSwitch):
+    def __init__(self, address: int, switch: NetworkSwitch):
         self._address = address
-        self._cpu = IntCodeCPUComplete(program)
         self._switch = switch
-        self._incoming: Deque[NetworkPacket] = deque([])
         self._output = []
 
-        self._cpu.add_input(self._address)
-
     @property
     def address(self) -> int:
         return self._address
 
-    @property
-    def has_incoming(self) -> bool:
-        return len(self._incoming) > 0
-
-    @property
-    def need_input(self) -> bool:
-        return self._cpu.need_input
-
-    def receive(self, message: NetworkPacket):
-        self._incoming.append(message)
-
-    def run(self) -> None:
-        if self._cpu.need_input:
-            if len(self._incoming) > 0:
-                message = self._incoming.popleft()
-                self._cpu.add_input(message.x)
-                self._cpu.add_input(message.y)
-            else:
-                self._cpu.add_input(-1)
-
-        self._cpu.run()
-
-        if self._cpu.has_output:
-            self._output.append(self._cpu.get_output())
+    def collect(self, value: int) -> None:
+        self._output.append(value)
 
-            if len(self._output) == 3:
-                self._switch.send(self.address, NetworkPacket(*self._output))
-                self._output = []
+        if len(self._output) == 3:
+            self._switch.send(self.address, NetworkPacket(*self._output))
+            self._output = []
 
 
 class NetworkSwitch(object):
     def __init__(self, program: List[int], use_nat: bool):
-        self._program = program
+        # computers waiting on an empty queue read -1 once and are then parked until a packet arrives for them
+        self._scheduler = IntCodeScheduler(program, idle_input=-1)
         self._computers: List[NetworkComputer] = []
         self._size = 0
         self._use_nat = use_nat
         self._nat_packet = None
+        self._last_nat_packet = None
 
     @property
     def nat_packet(self) -> Optional[NetworkPacket]:
         return self._nat_packet
 
     def add_computer(self):
-        self._computers.append(NetworkComputer(self._size, self._program, self))
+        self._computers.append(NetworkComputer(self._scheduler.spawn(self._size), self))
         self._size += 1
 
     def send(self, source: int, message: NetworkPacket) -> None:
@@ -97,22 +71,25 @@ class NetworkSwitch(object):
                 raise NetworkException()
         else:
             print(f"network computer {source} sending x={message.x} and y={message.y} to network computer {message.address}")
-            self._computers[message.address].receive(message)
+            self._scheduler.send(message.address, message.x, message.y)
+
+    def _on_output(self, address: int, value: int) -> None:
+        self._computers[address].collect(value)
+
+    def _on_idle(self) -> bool:
+        # every computer is parked on an empty queue
+        if not self._use_nat or self._nat_packet is None:
+            return False
+        print(f"nat detected network is idle...sending x={self._nat_packet.x} and y={self._nat_packet.y} to network computer 0")
+        if self._last_nat_packet is not None and self._last_nat_packet.y == self._nat_packet.y:
+            raise NetworkException()
+        self._last_nat_packet = self._nat_packet
+        self._scheduler.send(0, self._nat_packet.x, self._nat_packet.y)
+        return True
 
     def run(self) -> None:
         try:
-            last_nat_packet = None
-            while True:
-                for cpu in self._computers:
-                    cpu.run()
-
-                if self._use_nat and self._nat_packet is not None and reduce(lambda acc, c: acc and not c.has_incoming and c.need_input, self._computers, True):
-                    print(f"nat detected network is idle...sending x={self._nat_packet.x} and y={self._nat_packet.y} to network computer 0")
-                    self._computers[0].receive(self._nat_packet)
-                    if last_nat_packet is None or last_nat_packet.y != self._nat_packet.y:
-                        last_nat_packet = self._nat_packet
-                    else:
-                        raise NetworkException()
+            self._scheduler.run(self._on_output, self._on_idle)
         except NetworkException as e:
             pass
 
@@ -120,7 +97,7 @@ class NetworkSwitch(object):
 class Day23(Solution):
     def __init__(self, year: str, day: str):
         super().__init__(year, day)
-        self._input = [int(i) for i in self._load_input_as_string().split(',')]
+        self._input = self._load_input_as_ints()
 
     def part_one(self):
         ns = NetworkSwitch(self._input, False)
@@ -1,8 +1,9 @@
 from __future__ import annotations
 from adventofcode.common import Solution
+from adventofcode.common.automaton import LevelAutomaton, Rule
+from adventofcode.common.cycle import CycleDetector
 from adventofcode.common.grid import Point2D
-from functools import lru_cache
-from typing import Dict, List
+from typing import List
 
 
 deltas = (Point2D(0, -1), Point2D(1, 0), Point2D(0, 1), Point2D(-1, 0))
@@ -10,207 +11,100 @@ deltas = (Point2D(0, -1), Point2D(1, 0), Point2D(0, 1), Point2D(-1, 0))
 
 class Eris(object):
     def __init__(self, input: List[str]):
-        self._map = {Point2D(x, y): input[y][x] for x in range(len(input[0])) for y in range(len(input))}
+        # bug layout as a bitmask with tile y * size + x at bit y * size + x, which is also its biodiversity rating
         self._size = len(input)
+        self._bugs = sum(1 << (y * self._size + x) for y in range(self._size) for x in range(self._size) if input[y][x] == '#')
+        self._adjacent = [
+            sum(1 << (ny * self._size + nx) for nx, ny in ((x + d.x, y + d.y) for d in deltas) if 0 <= nx < self._size and 0 <= ny < self._size)
+            for y in range(self._size) for x in range(self._size)
+        ]
         self._minute = 0
 
-    def fingerprint(self) -> str:
-        s = []
-        for y in range(self._size):
-            for x in range(self._size):
-                s.append(self._map[Point2D(x, y)])
-        return "".join(s)
+    @property
+    def bugs(self) -> int:
+        return self._bugs
 
     def biodiversity(self):
-        biodiversity = 0
-        tile = 1
-        for y in range(self._size):
-            for x in range(self._size):
-                if self._map[Point2D(x, y)] == '#':
-                    biodiversity += pow(2, tile - 1)
-                tile += 1
-        return biodiversity
+        return self._bugs
+
+    def evolve(self, bugs: int) -> int:
+        # layout one minute after the given one
+        next_bugs = 0
+        for tile, adjacent in enumerate(self._adjacent):
+            adjacent_bugs = (bugs & adjacent).bit_count()
+            if adjacent_bugs == 1 or (adjacent_bugs == 2 and not bugs >> tile & 1):
+                next_bugs |= 1 << tile
+        return next_bugs
 
     def step(self) -> None:
-        next_map = {}
-        for x in range(self._size):
-            for y in range(self._size):
-                position = Point2D(x, y)
-                empty_spaces = 0
-                adjacent_bugs = 0
-                for delta in deltas:
-                    neighbor = position + delta
-                    if 0 <= neighbor.x < self._size and 0 <= neighbor.y < self._size:
-                        match self._map[neighbor]:
-                            case '.':
-                                empty_spaces += 1
-                            case '#':
-                                adjacent_bugs += 1
-                            case _:
-                                raise Exception(f"Unexpected map tile ({self._map[neighbor]}) and position {neighbor}")
-                    else:
-                        empty_spaces += 1
-
-                match self._map[position]:
-                    case '.':
-                        next_map[position] = '#' if 1 <= adjacent_bugs <= 2 else '.'
-                    case '#':
-                        next_map[position] = '#' if adjacent_bugs == 1 else '.'
-                    case _:
-                        raise Exception(f"Unexpected map tile ({self._map[position]}) and position {position}")
-        self._map = next_map
+        self._bugs = self.evolve(self._bugs)
         self._minute += 1
 
     def show(self) -> None:
         print(f"\nafter minute : {self._minute}")
         for y in range(self._size):
-            s = []
-            for x in range(self._size):
-                s.append(self._map[Point2D(x, y)])
-            print("".join(s))
+            print("".join('#' if self._bugs >> (y * self._size + x) & 1 else '.' for x in range(self._size)))
 
 
 class RecursiveEris(object):
     def __init__(self, input: List[str]):
-        self._maps = {
-            -1: {Point2D(x, y): '.' for x in range(len(input[0])) for y in range(len(input))},
-            0: {Point2D(x, y): input[y][x] for x in range(len(input[0])) for y in range(len(input))},
-            1: {Point2D(x, y): '.' for x in range(len(input[0])) for y in range(len(input))}
-        }
+        # every tile but the center is a cell on each level. levels further out are +1 and levels further in are -1
         self._size = len(input)
+        center = self._size // 2
+        self._tiles = [(x, y) for y in range(self._size) for x in range(self._size) if (x, y) != (center, center)]
+        tile_ids = {p: i for i, p in enumerate(self._tiles)}
+
+        adjacency = []
+        for x, y in self._tiles:
+            neighbors = []
+            for delta in deltas:
+                nx, ny = x + delta.x, y + delta.y
+                if not (0 <= nx < self._size and 0 <= ny < self._size):
+                    # neighbor is an edge....so it is the outer layer's tile next to the center
+                    neighbors.append((tile_ids[(center + delta.x, center + delta.y)], 1))
+                elif (nx, ny) == (center, center):
+                    # neighbor is center cell, so it is the whole facing edge of the inner layer
+                    edge = [(ex, ey) for ex, ey in self._tiles if (delta.x == 0 and ey == (self._size - 1 if delta.y < 0 else 0)) or (delta.y == 0 and ex == (self._size - 1 if delta.x < 0 else 0))]
+                    neighbors.extend((tile_ids[e], -1) for e in edge)
+                else:
+                    neighbors.append((tile_ids[(nx, ny)], 0))
+            adjacency.append(neighbors)
+
+        # a bug survives with exactly 1 adjacent bug and an empty space is infested with 1 or 2
+        self._automaton = LevelAutomaton(adjacency, Rule((1, 2), (1,)), ((tile_ids[(x, y)], 0) for x, y in self._tiles if input[y][x] == '#'))
         self._minute = 0
 
-    @lru_cache(maxsize=None)
-    def _get_outer_neighbor(self, layer: int, delta: Point2D) -> str:
-        if layer not in self._maps.keys():
-            # next layer does not exist yet, so treat it as empty space
-            return '.'
-
-        match delta.x, delta.y:
-            case 0, -1:
-                return self._maps[layer][Point2D(2, 1)]
-            case 1, 0:
-                return self._maps[layer][Point2D(3, 2)]
-            case 0, 1:
-                return self._maps[layer][Point2D(2, 3)]
-            case -1, 0:
-                return self._maps[layer][Point2D(1, 2)]
-            case _:
-                raise Exception(f"Invalid delta passed to get_outer_neighbor : {delta}")
-
-    @lru_cache(maxsize=None)
-    def _get_inner_neighbors(self, layer: int, delta: Point2D) -> List[str]:
-        if layer not in self._maps.keys():
-            # next layer does not exist yet, so treat it as empty space
-            return ['.'] * self._size
-
-        match delta.x, delta.y:
-            case 0, -1:
-                return [self._maps[layer][Point2D(x, self._size - 1)] for x in range(self._size)]
-            case 1, 0:
-                return [self._maps[layer][Point2D(0, y)] for y in range(self._size)]
-            case 0, 1:
-                return [self._maps[layer][Point2D(x, 0)] for x in range(self._size)]
-            case -1, 0:
-                return [self._maps[layer][Point2D(self._size - 1, y)] for y in range(self._size)]
-            case _:
-                raise Exception(f"Invalid delta passed to get_inner_neighbors : {delta}")
-
     def bugs(self) -> int:
-        count = 0
-        for layer, map in self._maps.items():
-            count += len([c for c in map.values() if c == '#'])
-        return count
+        return self._automaton.population
 
     def step(self) -> None:
-        # flush cache at the start of each step
-        self._get_outer_neighbor.cache_clear()
-        self._get_inner_neighbors.cache_clear()
-
-        lowest_layer = min(self._maps.keys()) - 1
-        highest_layer = max(self._maps.keys()) + 1
-
-        self._maps[lowest_layer] = {Point2D(x, y): '.' for x in range(self._size) for y in range(self._size)}
-        self._maps[highest_layer] = {Point2D(x, y): '.' for x in range(self._size) for y in range(self._size)}
+        self._automaton.step()
+        self._minute += 1
 
-        next_maps = {}
-        for layer in range(lowest_layer, highest_layer + 1):
-            next_maps[layer] = {}
+    def _show_layer(self, layer: int) -> None:
+        print(f"\nlayer : {layer}")
+        center = self._size // 2
+        for y in range(self._size):
+            s = []
             for x in range(self._size):
-                for y in range(self._size):
-                    position = Point2D(x, y)
-                    if position.x == 2 and position.y == 2:
-                        next_maps[layer][position] = '?'
-                        continue
-
-                    empty_spaces = 0
-                    adjacent_bugs = 0
-                    for delta in deltas:
-                        neighbor = position + delta
-                        if 0 <= neighbor.x < self._size and 0 <= neighbor.y < self._size:
-                            if neighbor.x == 2 and neighbor.y == 2:
-                                # neighbor is center cell, so get inner layer's outer edge
-                                inner_neighbors = self._get_inner_neighbors(layer - 1, delta)
-                                empty_spaces += sum([1 for c in inner_neighbors if c == '.'])
-                                adjacent_bugs += sum([1 for c in inner_neighbors if c == '#'])
-                            else:
-                                match self._maps[layer][neighbor]:
-                                    case '.':
-                                        empty_spaces += 1
-                                    case '#':
-                                        adjacent_bugs += 1
-                                    case _:
-                                        raise Exception(f"Unexpected map tile ({self._maps[layer][neighbor]}) at layer {layer} and position {neighbor}")
-                        else:
-                            # neighbor is an edge....get outer layer's inner edge
-                            c = self._get_outer_neighbor(layer + 1, delta)
-                            empty_spaces += 1 if c == '.' else 0
-                            adjacent_bugs += 1 if c == '#' else 0
-
-                    match self._maps[layer][position]:
-                        case '.':
-                            next_maps[layer][position] = '#' if 1 <= adjacent_bugs <= 2 else '.'
-                        case '#':
-                            next_maps[layer][position] = '#' if adjacent_bugs == 1 else '.'
-                        case _:
-                            raise Exception(f"Unexpected map tile ({self._maps[layer][position]}) at layer {layer} and position {position}")
-
-        # trim lowest and highest layer if it is all empty
-        for edge_layer in (lowest_layer, highest_layer):
-            if len([v for v in next_maps[edge_layer].values() if v == '#']) == 0:
-                next_maps.pop(edge_layer)
-
-        self._maps = next_maps
-        self._minute += 1
+                if (x, y) == (center, center):
+                    s.append('?')
+                else:
+                    s.append('#' if self._automaton.alive(self._tiles.index((x, y)), layer) else '.')
+            print("".join(s))
 
     def show(self) -> None:
         print(f"\nafter minute : {self._minute}")
-        if len(self._maps.keys()) < 20:
-            for layer in range(min(self._maps.keys()), max(self._maps.keys()) + 1):
-                print(f"\nlayer : {layer}")
-                for y in range(self._size):
-                    s = []
-                    for x in range(self._size):
-                        s.append(self._maps[layer][Point2D(x, y)])
-                    print("".join(s))
+        levels = self._automaton.levels
+        if len(levels) < 20:
+            for layer in levels:
+                self._show_layer(layer)
         else:
-            lowest = min(self._maps.keys())
-            highest = max(self._maps.keys()) + 1
-            for layer in range(lowest, lowest + 3):
-                print(f"\nlayer : {layer}")
-                for y in range(self._size):
-                    s = []
-                    for x in range(self._size):
-                        s.append(self._maps[layer][Point2D(x, y)])
-                    print("".join(s))
+            for layer in levels[:3]:
+                self._show_layer(layer)
             print("\n\n........\n")
-            for layer in range(highest - 3, highest):
-                print(f"\nlayer : {layer}")
-                for y in range(self._size):
-                    s = []
-                    for x in range(self._size):
-                        s.append(self._maps[layer][Point2D(x, y)])
-                    print("".join(s))
+            for layer in levels[-3:]:
+                self._show_layer(layer)
 
 
 class Day24(Solution):
@@ -221,19 +115,13 @@ class Day24(Solution):
     def part_one(self):
         e = Eris(self._input)
 
-        cache: Dict[str, int] = {}
-        biodiversity = 0
-        while True:
-            fingerprint = e.fingerprint()
-            if fingerprint not in cache:
-                cache[fingerprint] = e.biodiversity()
-            else:
-                biodiversity = cache[fingerprint]
-                break
+        # the first layout to appear twice is the one the cycle starts at
+        cycle = CycleDetector(e.evolve).find(e.bugs)
+        for _ in range(cycle.prefix):
             e.step()
 
         e.show()
-        return biodiversity
+        return e.biodiversity()
 
     def part_two(self):
         e = RecursiveEris(self._input)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from adventofcode.common import Solution
-from adventofcode.year2019.day09 import IntCodeCPUComplete
+from adventofcode.year2019.intcode import IntCodeCPU
 from typing import List
 
 
@@ -10,7 +10,7 @@ class QuitException(Exception):
 
 class ScoutBot(object):
     def __init__(self, program: List[int]):
-        self._cpu = IntCodeCPUComplete(program)
+        self._cpu = IntCodeCPU(program)
 
     def _validate(self, s: str) -> str:
         match s.split(' ')[0]:
@@ -55,7 +55,7 @@ class ScoutBot(object):
 class Day25(Solution):
     def __init__(self, year: str, day: str):
         super().__init__(year, day)
-        self._input = [int(i) for i in self._load_input_as_string().split(',')]
+        self._input = self._load_input_as_ints()
 
     def part_one(self):
         sb = ScoutBot(self._input)
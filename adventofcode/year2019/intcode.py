@@ -0,0 +1,445 @@
+from __future__ import annotations
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple, TypeVar
+
+import os
+
+
+PAGE_BITS = 8
+PAGE_SIZE = 1 << PAGE_BITS
+PAGE_MASK = PAGE_SIZE - 1
+
+
+# instruction word -> (opcode, parameter modes). keyed by the word itself rather than its address, so
+# a self-modifying write that changes an instruction is decoded afresh on its next fetch and never sees a stale entry
+_decoded: Dict[int, Tuple[int, Tuple[int, int, int]]] = {}
+
+
+def decode(word: int) -> Tuple[int, Tuple[int, int, int]]:
+    decoded = _decoded.get(word)
+    if decoded is None:
+        value = abs(word)
+        opcode = value % 100
+        modes = (value // 100 % 10, value // 1000 % 10, value // 10000 % 10)
+        for mode in modes:
+            if mode not in (0, 1, 2):
+                raise Exception(f"Invalid parameter mode : {mode}")
+        decoded = _decoded[word] = (opcode, modes)
+    return decoded
+
+
+# instruction length in words, including the opcode itself
+lengths = {1: 4, 2: 4, 3: 2, 4: 2, 5: 3, 6: 3, 7: 4, 8: 4, 9: 2, 99: 1}
+
+
+class IntCodeTracer(object):
+    def __init__(self, capacity: int = 65536):
+        # ring buffer of the last capacity instructions as flat (ip, instruction word, operand 1, operand 2, operand 3) records
+        self._capacity = capacity
+        self._records = array('q', [0] * (capacity * 5))
+        self._recorded = 0
+        self._counts: Dict[int, int] = {}
+        # instruction length at each ip when first executed
+        self._lengths: Dict[int, int] = {}
+        # taken jumps keyed by (from ip, to ip)
+        self._jumps: Dict[Tuple[int, int], int] = {}
+
+    @property
+    def recorded(self) -> int:
+        return self._recorded
+
+    @property
+    def counts(self) -> Dict[int, int]:
+        return self._counts
+
+    def record(self, ip: int, memory: IntCodeMemory, next_ip: int) -> None:
+        offset = (self._recorded % self._capacity) * 5
+        records = self._records
+        records[offset] = ip
+        records[offset + 1] = memory.read(ip)
+        records[offset + 2] = memory.read(ip + 1)
+        records[offset + 3] = memory.read(ip + 2)
+        records[offset + 4] = memory.read(ip + 3)
+        self._recorded += 1
+        count = self._counts.get(ip, 0)
+        if count == 0:
+            self._lengths[ip] = lengths.get(records[offset + 1] % 100, 1)
+        self._counts[ip] = count + 1
+        if next_ip != ip + self._lengths[ip] and records[offset + 1] % 100 != 99:
+            self._jumps[(ip, next_ip)] = self._jumps.get((ip, next_ip), 0) + 1
+
+    def entries(self) -> List[Tuple[int, int, int, int, int]]:
+        # oldest first. operand words past the end of the instruction are whatever followed it in memory
+        size = min(self._recorded, self._capacity)
+        first = self._recorded - size
+        entries = []
+        for n in range(first, self._recorded):
+            offset = (n % self._capacity) * 5
+            entries.append(tuple(self._records[offset:(offset + 5)]))
+        return entries
+
+    def hot_blocks(self, top: int = 10) -> List[Tuple[int, int, int]]:
+        # (first ip, last ip, executions) of the most executed basic blocks. a block starts at the entry point, at any
+        # jump target and after any jump, and runs over consecutively executed instructions
+        leaders = {0}
+        for source, target in self._jumps.keys():
+            leaders.add(target)
+        ends = {source for source, _ in self._jumps.keys()}
+
+        blocks = []
+        start = previous = None
+        for ip in sorted(self._counts.keys()):
+            if start is not None and (ip in leaders or previous in ends or ip != previous + self._lengths[previous]):
+                blocks.append((start, previous, self._counts[start]))
+                start = None
+            if start is None:
+                start = ip
+            previous = ip
+        if start is not None:
+            blocks.append((start, previous, self._counts[start]))
+
+        return sorted(blocks, key=lambda b: -b[2])[:top]
+
+    def hot_loops(self, top: int = 10) -> List[Tuple[int, int, int]]:
+        # (loop head, back edge ip, iterations) for every backward jump taken
+        loops = [(target, source, count) for (source, target), count in self._jumps.items() if target <= source]
+        return sorted(loops, key=lambda l: -l[2])[:top]
+
+    def report(self, top: int = 10) -> str:
+        lines = [f"{self._recorded} instructions over {len(self._counts)} addresses", "hot blocks :"]
+        for first, last, count in self.hot_blocks(top):
+            lines.append(f"  {first:>6}-{last:<6} {count:>12}")
+        lines.append("hot loops :")
+        for head, back_edge, count in self.hot_loops(top):
+            lines.append(f"  {head:>6}<-{back_edge:<6} {count:>12}")
+        return "\n".join(lines)
+
+
+class IntCodeMemory(object):
+    def __init__(self, values: List[int] = ()):
+        # fixed size pages shared between forks until one side writes to them. None is an untouched page of zeros
+        values = list(values)
+        self._pages: List[Optional[List[int]]] = [values[i:(i + PAGE_SIZE)] for i in range(0, len(values), PAGE_SIZE)]
+        if len(self._pages) > 0:
+            self._pages[-1].extend([0] * (PAGE_SIZE - len(self._pages[-1])))
+        # pages this memory may modify in place because no fork can see them
+        self._owned: Set[int] = set(range(len(self._pages)))
+
+    def read(self, index: int) -> int:
+        try:
+            return self._pages[index >> PAGE_BITS][index & PAGE_MASK]
+        except (IndexError, TypeError):
+            # memory beyond the program reads as zero without having to be allocated
+            return 0
+
+    def write(self, index: int, value: int) -> None:
+        page = index >> PAGE_BITS
+        pages = self._pages
+        if page >= len(pages):
+            pages.extend([None] * (page + 1 - len(pages)))
+        if page not in self._owned:
+            values = pages[page]
+            pages[page] = [0] * PAGE_SIZE if values is None else values[:]
+            self._owned.add(page)
+        pages[page][index & PAGE_MASK] = value
+
+    def fork(self) -> IntCodeMemory:
+        # O(pages) copy of the page table. both sides give up ownership so the next write to a shared page copies it
+        memory = IntCodeMemory()
+        memory._pages = self._pages[:]
+        self._owned = set()
+        return memory
+
+
+class IntCodeSnapshot(object):
+    def __init__(self, memory: IntCodeMemory, relative_base: int, instruction_index: int, inputs: Tuple[int, ...], output: int, need_input: bool, has_output: bool, halted: bool):
+        self._memory = memory
+        self._relative_base = relative_base
+        self._instruction_index = instruction_index
+        self._inputs = inputs
+        self._output = output
+        self._need_input = need_input
+        self._has_output = has_output
+        self._halted = halted
+
+
+class IntCodeCPU(object):
+    def __init__(self, instructions: List[int], verbose: bool = False):
+        self._memory = IntCodeMemory(instructions)
+        self._relative_base = 0
+        self._instruction_index = 0
+        self._inputs = deque([])
+        self._output = 0
+        self._need_input = False
+        self._has_output = False
+
+        self._halted = False
+        self._verbose = verbose
+        self._tracer: Optional[IntCodeTracer] = None
+
+        # flat dispatch table indexed by opcode
+        self._operations: List[Optional[Callable[[int, Tuple[int, int, int]], int]]] = [None] * 100
+        self._operations[1] = self._add
+        self._operations[2] = self._multiply
+        self._operations[3] = self._input
+        self._operations[4] = self._output_value
+        self._operations[5] = self._jump_if_true
+        self._operations[6] = self._jump_if_false
+        self._operations[7] = self._less_than
+        self._operations[8] = self._equals
+        self._operations[9] = self._adjust_relative_base
+        self._operations[99] = self._halt
+
+    @property
+    def need_input(self) -> bool:
+        return self._need_input
+
+    @property
+    def has_output(self) -> bool:
+        return self._has_output
+
+    @property
+    def halted(self) -> bool:
+        return self._halted
+
+    @property
+    def is_input_empty(self) -> bool:
+        return len(self._inputs) == 0
+
+    def add_input(self, value: int):
+        self._inputs.append(value)
+        self._need_input = False
+
+    def clear_input(self):
+        self._inputs.clear()
+        self._need_input = True
+
+    def get_output(self) -> int:
+        self._has_output = False
+        return self._output
+
+    def read_memory(self, index: int) -> int:
+        return self._memory.read(index)
+
+    def write_memory(self, index: int, value: int) -> None:
+        self._memory.write(index, value)
+
+    def snapshot(self) -> IntCodeSnapshot:
+        return IntCodeSnapshot(self._memory.fork(), self._relative_base, self._instruction_index, tuple(self._inputs), self._output, self._need_input, self._has_output, self._halted)
+
+    def restore(self, snapshot: IntCodeSnapshot) -> None:
+        # the snapshot keeps its own view of memory so it can be restored any number of times
+        self._memory = snapshot._memory.fork()
+        self._relative_base = snapshot._relative_base
+        self._instruction_index = snapshot._instruction_index
+        self._inputs = deque(snapshot._inputs)
+        self._output = snapshot._output
+        self._need_input = snapshot._need_input
+        self._has_output = snapshot._has_output
+        self._halted = snapshot._halted
+
+    def fork(self) -> IntCodeCPU:
+        # independent cpu continuing from the current state, sharing memory pages until either side writes to them
+        cpu = IntCodeCPU([], self._verbose)
+        cpu.restore(self.snapshot())
+        cpu._tracer = self._tracer
+        return cpu
+
+    def attach_tracer(self, tracer: Optional[IntCodeTracer]) -> None:
+        # forks made afterwards record into the same tracer. None detaches it
+        self._tracer = tracer
+
+    def _address(self, index: int, mode: int) -> int:
+        match mode:
+            case 0:
+                return self._memory.read(index)
+            case 1:
+                return index
+            case _:
+                return self._relative_base + self._memory.read(index)
+
+    def _value(self, index: int, mode: int) -> int:
+        read = self._memory.read
+        match mode:
+            case 0:
+                return read(read(index))
+            case 1:
+                return read(index)
+            case _:
+                return read(self._relative_base + read(index))
+
+    def _trace(self, ip: int, length: int, message: str) -> None:
+        print(f"{ip}: {[self._memory.read(i) for i in range(ip, ip + length)]} : {message}")
+
+    def _add(self, ip: int, modes: Tuple[int, int, int]) -> int:
+        param1 = self._value(ip + 1, modes[0])
+        param2 = self._value(ip + 2, modes[1])
+        param3 = self._address(ip + 3, modes[2])
+        if self._verbose:
+            self._trace(ip, 4, f"address[{param3}] = {param1} + {param2}")
+        self._memory.write(param3, param1 + param2)
+        return ip + 4
+
+    def _multiply(self, ip: int, modes: Tuple[int, int, int]) -> int:
+        param1 = self._value(ip + 1, modes[0])
+        param2 = self._value(ip + 2, modes[1])
+        param3 = self._address(ip + 3, modes[2])
+        if self._verbose:
+            self._trace(ip, 4, f"address[{param3}] = {param1} * {param2}")
+        self._memory.write(param3, param1 * param2)
+        return ip + 4
+
+    def _input(self, ip: int, modes: Tuple[int, int, int]) -> int:
+        if len(self._inputs) == 0:
+            # stay on this instruction until input is added
+            self._need_input = True
+            return ip
+        param1 = self._address(ip + 1, modes[0])
+        value = self._inputs.popleft()
+        if self._verbose:
+            self._trace(ip, 2, f"address[{param1}] = {value}")
+        self._memory.write(param1, value)
+        return ip + 2
+
+    def _output_value(self, ip: int, modes: Tuple[int, int, int]) -> int:
+        param1 = self._value(ip + 1, modes[0])
+        if self._verbose:
+            self._trace(ip, 2, f"output address[{param1}]")
+        self._output = param1
+        self._has_output = True
+        return ip + 2
+
+    def _jump_if_true(self, ip: int, modes: Tuple[int, int, int]) -> int:
+        next_index = self._value(ip + 2, modes[1]) if self._value(ip + 1, modes[0]) != 0 else ip + 3
+        if self._verbose:
+            self._trace(ip, 3, f"pointer = {next_index}")
+        return next_index
+
+    def _jump_if_false(self, ip: int, modes: Tuple[int, int, int]) -> int:
+        next_index = self._value(ip + 2, modes[1]) if self._value(ip + 1, modes[0]) == 0 else ip + 3
+        if self._verbose:
+            self._trace(ip, 3, f"pointer = {next_index}")
+        return next_index
+
+    def _less_than(self, ip: int, modes: Tuple[int, int, int]) -> int:
+        value = 1 if self._value(ip + 1, modes[0]) < self._value(ip + 2, modes[1]) else 0
+        param3 = self._address(ip + 3, modes[2])
+        if self._verbose:
+            self._trace(ip, 4, f"address[{param3}] = {value}")
+        self._memory.write(param3, value)
+        return ip + 4
+
+    def _equals(self, ip: int, modes: Tuple[int, int, int]) -> int:
+        value = 1 if self._value(ip + 1, modes[0]) == self._value(ip + 2, modes[1]) else 0
+        param3 = self._address(ip + 3, modes[2])
+        if self._verbose:
+            self._trace(ip, 4, f"address[{param3}] = {value}")
+        self._memory.write(param3, value)
+        return ip + 4
+
+    def _adjust_relative_base(self, ip: int, modes: Tuple[int, int, int]) -> int:
+        param1 = self._value(ip + 1, modes[0])
+        if self._verbose:
+            self._trace(ip, 2, f"relative base : {self._relative_base} + {param1}")
+        self._relative_base += param1
+        return ip + 2
+
+    def _halt(self, ip: int, modes: Tuple[int, int, int]) -> int:
+        self._halted = True
+        return ip
+
+    def run(self) -> None:
+        operations = self._operations
+        tracer = self._tracer
+        ip = self._instruction_index
+        while not self._halted and not self._need_input and not self._has_output:
+            opcode, modes = decode(self._memory.read(ip))
+            operation = operations[opcode]
+            if operation is None:
+                raise Exception(f"Invalid opcode {self.read_memory(ip)} @ {ip}")
+            if tracer is None:
+                ip = operation(ip, modes)
+            else:
+                next_ip = operation(ip, modes)
+                # an input instruction waiting for input has not executed yet
+                if next_ip != ip or self._halted:
+                    tracer.record(ip, self._memory, next_ip)
+                ip = next_ip
+        self._instruction_index = ip
+
+
+class IntCodeScheduler(object):
+    def __init__(self, program: List[int], idle_input: Optional[int] = None, verbose: bool = False):
+        # every machine is forked from one loaded image, sharing its decoded instructions and memory pages
+        self._image = IntCodeCPU(program, verbose)
+        self._machines: List[IntCodeCPU] = []
+        self._ready: Deque[int] = deque([])
+        self._parked: Set[int] = set()
+        # value handed to a machine that asks for input with nothing queued, once per wake-up, before it gets parked
+        self._idle_input = idle_input
+        self._idled: List[bool] = []
+
+    @property
+    def parked(self) -> int:
+        return len(self._parked)
+
+    def spawn(self, *inputs: int) -> int:
+        cpu = self._image.fork()
+        for value in inputs:
+            cpu.add_input(value)
+        self._machines.append(cpu)
+        self._idled.append(False)
+        self._ready.append(len(self._machines) - 1)
+        return len(self._machines) - 1
+
+    def send(self, machine: int, *values: int) -> None:
+        cpu = self._machines[machine]
+        for value in values:
+            cpu.add_input(value)
+        self._idled[machine] = False
+        if machine in self._parked:
+            self._parked.remove(machine)
+            self._ready.append(machine)
+
+    def run(self, on_output: Callable[[int, int], None], on_idle: Optional[Callable[[], bool]] = None) -> None:
+        # runs ready machines until every machine is parked on input or halted, then asks on_idle whether to carry on
+        while True:
+            while len(self._ready) > 0:
+                machine = self._ready.popleft()
+                cpu = self._machines[machine]
+                while True:
+                    cpu.run()
+                    if not cpu.has_output:
+                        break
+                    self._idled[machine] = False
+                    on_output(machine, cpu.get_output())
+
+                if cpu.need_input:
+                    if self._idle_input is not None and not self._idled[machine]:
+                        self._idled[machine] = True
+                        cpu.add_input(self._idle_input)
+                        self._ready.append(machine)
+                    else:
+                        self._parked.add(machine)
+
+            if on_idle is None or not on_idle():
+                return
+
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def run_parallel(function: Callable[[T], R], jobs: Iterable[T], workers: Optional[int] = 1) -> List[R]:
+    # independent jobs run in process by default. a process pool is opt in with workers > 1 (None for one per cpu) and
+    # only pays off when each job is much slower than starting a process. function must be picklable
+    jobs = list(jobs)
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    if workers == 1 or len(jobs) < 2:
+        return [function(job) for job in jobs]
+    # hand jobs over in a few chunks per worker rather than one round trip each
+    chunksize = max(1, len(jobs) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, jobs, chunksize=chunksize))
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from adventofcode.common import Solution
+from adventofcode.common.automaton import LifeGrid, Rule
 from adventofcode.common.grid import Point2D
 from typing import Dict, List
 
@@ -14,6 +15,8 @@ deltas = (
 class SeatSystem(object):
     def __init__(self, seats: List[str]):
         self._seats: Dict[Point2D, str] = {}
+        self._width = len(seats[0])
+        self._height = len(seats)
 
         for y, line in enumerate(seats):
             for x, seat in enumerate(line):
@@ -25,31 +28,15 @@ class SeatSystem(object):
         return sum((1 for seat in self._seats.values() if seat == '#'))
 
     def simulate_adjacent_seat(self) -> None:
-        last_occupied = None
-        while self.occupied != last_occupied:
-            last_occupied = self.occupied
-
-            next_seats = {}
-            for position, seat in self._seats.items():
-                if seat == '.':
-                    next_seats[position] = seat
-                    continue
-
-                adjacent_occupied = 0
-
-                for delta in deltas:
-                    neighbor = position + delta
-                    adjacent_occupied += 1 if neighbor in self._seats and self._seats[neighbor] == '#' else 0
-
-                match seat:
-                    case 'L':
-                        next_seats[position] = '#' if adjacent_occupied == 0 else 'L'
-                    case '#':
-                        next_seats[position] = 'L' if adjacent_occupied >= 4 else '#'
-                    case _:
-                        raise Exception(f"Invalid seat ({seat}) at position {position}")
-
-            self._seats = next_seats
+        # empty seats fill up with no occupied seat around them and occupied seats empty out with 4 or more around them,
+        # which is a life-like rule that only ever applies on seats
+        seats = [(p.x, p.y) for p, seat in self._seats.items() if seat != '.']
+        occupied = [(p.x, p.y) for p, seat in self._seats.items() if seat == '#']
+        grid = LifeGrid((self._width, self._height), Rule((0,), (0, 1, 2, 3)), occupied, habitat=seats)
+        grid.settle()
+
+        for x, y in seats:
+            self._seats[Point2D(x, y)] = '#' if grid.alive((x, y)) else 'L'
 
     def simulate_visible_seat(self):
         last_occupied = None
@@ -2,7 +2,7 @@ from __future__ import annotations
 from abc import abstractmethod
 from adventofcode.common import Solution
 from adventofcode.common.grid import Point2D
-from adventofcode.common.graph.search import AStar, SearchState, S
+from adventofcode.common.graph.search import AStar, BucketFrontier, SearchState, S
 from adventofcode.common.util import show_dict_grid
 from typing import Iterable, List, Protocol
 
@@ -100,7 +100,7 @@ class BigChitonCave(object):
 
 class LowestRiskSearchState(SearchState):
     def __init__(self, cave: ChitonCave, position: Point2D, cost: int):
-        super().__init__(f"{position}", 0, cost)
+        super().__init__((position.x, position.y), 0, cost)
         self._cave = cave
         self._position = position
 
@@ -123,7 +123,8 @@ class Day15(Solution):
     def part_one(self):
         astar = AStar(
             LowestRiskSearchState(self._scc, Point2D(0, 0), 0),
-            LowestRiskSearchState(self._scc, Point2D(self._scc.maxx - 1, self._scc.maxy - 1), 0)
+            LowestRiskSearchState(self._scc, Point2D(self._scc.maxx - 1, self._scc.maxy - 1), 0),
+            BucketFrontier
         )
         astar.verbose(True, 10000)
         best = astar.find_path()
@@ -134,7 +135,8 @@ class Day15(Solution):
         bcc = BigChitonCave(self._scc)
         astar = AStar(
             LowestRiskSearchState(bcc, Point2D(0, 0), 0),
-            LowestRiskSearchState(bcc, Point2D(bcc.maxx - 1, bcc.maxy - 1), 0)
+            LowestRiskSearchState(bcc, Point2D(bcc.maxx - 1, bcc.maxy - 1), 0),
+            BucketFrontier
         )
         astar.verbose(True, 10000)
         best = astar.find_path()
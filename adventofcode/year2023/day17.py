@@ -1,7 +1,7 @@
 from __future__ import annotations
 from adventofcode.common import Solution
 from adventofcode.common.grid import Point2D
-from adventofcode.common.graph.search import AStar, SearchState, S, P
+from adventofcode.common.graph.search import AStar, BucketFrontier, SearchState, S, P
 from adventofcode.common.util import show_dict_grid
 from typing import Dict, List
 
@@ -45,9 +45,9 @@ class TrafficMap(object):
 class CrucibleMinimumHeatLossSearchState(SearchState):
     def __init__(self, traffic_map: TrafficMap, position: Point2D, direction: str, steps: int, min_steps: int, max_steps: int, cost: int):
         if direction != '@':    # all positions besides the start/end position needs position + steps + direction as key for search
-            super().__init__(f"{position}:{steps}:{direction}", 0, cost)
+            super().__init__((position.x, position.y, steps, direction), 0, cost)
         else:   # end position just need position to match
-            super().__init__(f"{position}", 0, cost)
+            super().__init__((position.x, position.y), 0, cost)
         self._traffic_map = traffic_map
         self._position = position
         self._direction = direction
@@ -133,7 +133,7 @@ class Day17(Solution):
     def part_one(self):
         ss = CrucibleMinimumHeatLossSearchState(self._traffic_map, Point2D(0, 0), '*', 0, 0, 3, 0)
         es = CrucibleMinimumHeatLossSearchState(self._traffic_map, Point2D(self._traffic_map.maxx - 1, self._traffic_map.maxy - 1), '@', 0, 0, 3, 0)
-        astar = AStar(ss, es)
+        astar = AStar(ss, es, BucketFrontier)
         astar.verbose(True, 10000)
         best = astar.find_path()
         self._traffic_map.show(best)
@@ -142,7 +142,7 @@ class Day17(Solution):
     def part_two(self):
         ss = UltraCrucibleMinimumHeatLossSearchState(self._traffic_map, Point2D(0, 0), '*', 0, 4, 10, 0)
         es = UltraCrucibleMinimumHeatLossSearchState(self._traffic_map, Point2D(self._traffic_map.maxx - 1, self._traffic_map.maxy - 1), '@', 0, 4, 10, 0)
-        astar = AStar(ss, es)
+        astar = AStar(ss, es, BucketFrontier)
         astar.verbose(True, 100000)
         best = astar.find_path()
         self._traffic_map.show(best)
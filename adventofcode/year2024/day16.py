@@ -1,7 +1,7 @@
 from __future__ import annotations
 from adventofcode.common import Solution
 from adventofcode.common.grid import Point2D
-from adventofcode.common.graph.search import AStar, SearchState, S
+from adventofcode.common.graph.search import AStar, BucketFrontier, SearchState, S
 from adventofcode.common.util import show_dict_grid
 from typing import Iterable, List, Tuple
 
@@ -35,9 +35,9 @@ class MinimumTurnSearchState(SearchState):
         self._facing = facing
         if self._maze.end == self._position:
             # end position only uses position as fingerprint
-            super().__init__(f"{position}", 0, cost)
+            super().__init__((position.x, position.y), 0, cost)
         else:
-            super().__init__(f"{position}{facing}", 0, cost)
+            super().__init__((position.x, position.y, facing), 0, cost)
 
     @property
     def position(self) -> Point2D:
@@ -112,7 +112,7 @@ class Day16(Solution):
     def part_one(self):
         ss = MinimumTurnSearchState(self._maze, self._maze.start, self._maze.facing, 0)
         es = MinimumTurnSearchState(self._maze, self._maze.end, '*', 0)
-        astar = AStar(ss, es)
+        astar = AStar(ss, es, BucketFrontier)
         astar.verbose(True, 10000)
         best = astar.find_path()
         self._maze.show([(s.position, s.facing) for s in best.search_states])
@@ -121,7 +121,7 @@ class Day16(Solution):
     def part_two(self):
         ss = MinimumTurnSearchState(self._maze, self._maze.start, self._maze.facing, 0)
         es = MinimumTurnSearchState(self._maze, self._maze.end, '*', 0)
-        astar = AStar(ss, es)
+        astar = AStar(ss, es, BucketFrontier)
         astar.verbose(True, 10000)
         best_spots = set([])
         for shortest_path in astar.find_all_paths():
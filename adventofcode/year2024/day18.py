@@ -1,7 +1,7 @@
 from __future__ import annotations
 from adventofcode.common import Solution
 from adventofcode.common.grid import Point2D
-from adventofcode.common.graph.search import AStar, SearchState, S, P
+from adventofcode.common.graph.search import AStar, BidirectionalDijkstra, BucketFrontier, SearchState, S, P
 from adventofcode.common.util import show_dict_grid
 from typing import List
 
@@ -87,18 +87,19 @@ class Day18(Solution):
         mg = MemoryGrid(memory_space, self._input[:falling_memory_limit])
         ss = ShortestPathSearchState(mg, mg.start, 0)
         es = ShortestPathSearchState(mg, mg.end, 0)
-        astar = AStar(ss, es)
+        astar = AStar(ss, es, BucketFrontier)
         astar.verbose(True, 10000)
         p = astar.find_path()
         mg.show(p)
         return len(p.search_states) - 1
 
     def part_two(self):
-        # binary search to get first memory position that will block a path
+        # binary search to get first memory position that will block a path. a probe only needs to know whether start
+        # and end still connect, so it searches from both ends and always grows the smaller side, which runs dry quickly
+        # once a wall of bytes has cut either corner off
         memory_space = 70
         lower_memory_limit = 1024
         upper_memory_limit = len(self._input)
-        last_shortest_path = None
         last_memory_with_no_path = None
         while True:
             candidate_memory_limit = (lower_memory_limit + upper_memory_limit) // 2
@@ -110,19 +111,19 @@ class Day18(Solution):
             mg = MemoryGrid(memory_space, self._input[:(candidate_memory_limit + 1)])
             ss = ShortestPathSearchState(mg, mg.start, 0)
             es = ShortestPathSearchState(mg, mg.end, 0)
-            astar = AStar(ss, es)
-            p = astar.find_path()
+            search = BidirectionalDijkstra(ss, es, frontier=BucketFrontier)
 
-            if p.search_states[-1].position == mg.end:
+            if search.find_cost() is not None:
                 print(f"byte #{str(candidate_memory_limit + 1)} {self._input[candidate_memory_limit]} has a path")
                 lower_memory_limit = candidate_memory_limit
-                last_shortest_path = p
             else:
                 print(f"byte #{str(candidate_memory_limit + 1)} {self._input[candidate_memory_limit]} has no path")
                 upper_memory_limit = candidate_memory_limit
                 last_memory_with_no_path = candidate_memory_limit
 
+        # the last path before the blockade, only found to be shown
         mg = MemoryGrid(memory_space, self._input[:last_memory_with_no_path])
+        last_shortest_path = AStar(ShortestPathSearchState(mg, mg.start, 0), ShortestPathSearchState(mg, mg.end, 0), BucketFrontier).find_path()
         mg.show(last_shortest_path, self._input[last_memory_with_no_path])
 
         return f"{self._input[last_memory_with_no_path].x},{self._input[last_memory_with_no_path].y}"
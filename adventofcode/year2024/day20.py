@@ -1,7 +1,7 @@
 from __future__ import annotations
 from adventofcode.common import Solution
 from adventofcode.common.grid import Point2D
-from adventofcode.common.graph.search import AStar, SearchState, S
+from adventofcode.common.graph.search import AStar, BucketFrontier, SearchState, S
 from adventofcode.common.util import show_dict_grid
 from typing import Iterable, List
 
@@ -90,7 +90,8 @@ class Day20(Solution):
         self._par_path = {}
         astar = AStar(
             HonestPathSearchState(self._rt, self._rt.start, 0, 0),
-            HonestPathSearchState(self._rt, self._rt.end, 0, 0)
+            HonestPathSearchState(self._rt, self._rt.end, 0, 0),
+            BucketFrontier
         )
         astar.verbose(True, 10000)
         for s in astar.find_path().search_states:
@@ -1,64 +1,46 @@
 from __future__ import annotations
 from adventofcode.common import Solution
-from adventofcode.common.grid import Point2D
-from adventofcode.common.util import show_dict_grid
-from typing import Dict, List, Set
+from adventofcode.common.grid import DenseGrid
+from typing import Set
 
 
-deltas = (Point2D(-1, -1), Point2D(0, -1), Point2D(1, -1), Point2D(-1, 0), Point2D(1, 0), Point2D(-1, 1), Point2D(0, 1), Point2D(1, 1))
+paper_roll = ord('@')
 
 
 class PrintingDepartmentMap(object):
-    def __init__(self, data: List[str]):
-        self._maxy = len(data)
-        self._maxx = len(data[0])
-        self._paper_rolls = []
-        self._grid = {}
-        for y, row in enumerate(data):
-            for x, c in enumerate(row):
-                p = Point2D(x, y)
-                self._grid[p] = c
-                if c == '@':
-                    self._paper_rolls.append(p)
+    def __init__(self, grid: DenseGrid):
+        self._grid = grid
+        self._paper_rolls = set(grid.find_all('@'))
 
     @property
-    def maxx(self) -> int:
-        return self._maxx
-
-    @property
-    def maxy(self) -> int:
-        return self._maxy
-
-    @property
-    def grid(self) -> Dict[Point2D]:
+    def grid(self) -> DenseGrid:
         return self._grid
 
-    def _neighbors(self, position: Point2D) -> List[Point2D]:
-        neighbors = []
-        for delta in deltas:
-            neighbor_p = position + delta
-            if neighbor_p in self._grid and self._grid[neighbor_p] == '@':
-                neighbors.append(neighbor_p)
-        return neighbors
+    def _neighbors(self, position: int) -> int:
+        # number of paper rolls next to position
+        cells = self._grid.cells
+        return sum(1 for neighbor in self._grid.neighbors(position, True) if cells[neighbor] == paper_roll)
 
-    def remove(self, position: Point2D) -> None:
-        if position not in self._grid or self._grid[position] != '@':
-            raise Exception(f"invalid paper roll position : {position}")
+    def remove(self, position: int) -> None:
+        if position not in self._paper_rolls:
+            raise Exception(f"invalid paper roll position : {self._grid.point(position)}")
         self._grid[position] = '.'
         self._paper_rolls.remove(position)
 
-    def accessible(self, max_neighbors: int) -> Set[Point2D]:
-        accessible_roll = []
-        for p in self._paper_rolls:
-            if len(self._neighbors(p)) < max_neighbors:
-                accessible_roll.append(p)
-        return set(accessible_roll)
+    def accessible(self, max_neighbors: int) -> Set[int]:
+        return set(p for p in self._paper_rolls if self._neighbors(p) < max_neighbors)
+
+    def show(self, marked: Set[int]) -> None:
+        grid = self._grid.copy()
+        for p in marked:
+            grid[p] = 'x'
+        grid.show()
 
 
 class Day04(Solution):
     def __init__(self, year: str, day: str):
         super().__init__(year, day)
-        self._pdm = PrintingDepartmentMap(self._load_input_as_lines())
+        self._pdm = PrintingDepartmentMap(DenseGrid.from_bytes(self._load_input_as_bytes()))
 
     def part_one(self):
         return len(self._pdm.accessible(4))
@@ -67,12 +49,12 @@ class Day04(Solution):
         total = 0
         removable_rolls = self._pdm.accessible(4)
         print('initial:')
-        show_dict_grid({(p.x, p.y): 'x' if p in removable_rolls else v for p, v in self._pdm.grid.items()}, self._pdm.maxx, self._pdm.maxy)
+        self._pdm.show(removable_rolls)
         while len(removable_rolls) > 0:
             print(f"moving {len(removable_rolls)} paper rolls")
             total += len(removable_rolls)
             for p in removable_rolls:
                 self._pdm.remove(p)
             removable_rolls = self._pdm.accessible(4)
-        show_dict_grid({(p.x, p.y): 'x' if p in removable_rolls else v for p, v in self._pdm.grid.items()}, self._pdm.maxx, self._pdm.maxy)
-        return total
\ No newline at end of file
+        self._pdm.show(removable_rolls)
+        return total